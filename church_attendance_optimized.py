@@ -5,15 +5,19 @@ A Streamlit-based web application for managing church attendance records using G
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import gspread
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
 import time
+import random
+import threading
 from functools import wraps
 from typing import Dict, List, Optional, Tuple
 import json
 import hashlib
+import hmac
 import secrets
 import io
 import base64
@@ -33,6 +37,9 @@ import os
 import extra_streamlit_components as stx
 import re
 import html
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # INPUT VALIDATION & SANITIZATION UTILITIES
@@ -230,7 +237,10 @@ st.set_page_config(
 )
 
 # Custom CSS for The Apostolic Church Ghana branding
-st.markdown("""
+@st.cache_resource
+def _theme_css() -> str:
+    """Build the theme stylesheet once per process instead of on every rerun"""
+    return """
 <style>
     /* The Apostolic Church Ghana Color Scheme */
     :root {
@@ -494,26 +504,146 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(_theme_css(), unsafe_allow_html=True)
+
+
+# Rate limiting
+class TokenBucket:
+    """Token bucket shared by every call that draws on one Sheets API quota"""
+    
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take a token, sleeping only as long as the refill requires"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_sec)
+            self.updated = now
+            # Reserve the token now so concurrent callers queue behind this one
+            self.tokens -= 1
+            wait = -self.tokens / self.refill_per_sec if self.tokens < 0 else 0
+        
+        if wait > 0:
+            time.sleep(wait)
+
+
+@st.cache_resource
+def _get_token_buckets() -> Tuple[TokenBucket, TokenBucket]:
+    """Read and write buckets shared by every session and rerun in this process"""
+    # Sheets allows 60 reads and 60 writes per minute per user
+    return TokenBucket(capacity=60, refill_per_sec=1.0), TokenBucket(capacity=60, refill_per_sec=1.0)
+
+
+@st.cache_resource
+def _get_sheets_semaphore() -> threading.BoundedSemaphore:
+    """Limit on Sheets requests in flight at once across every session in this process"""
+    return threading.BoundedSemaphore(5)
+
+
+# Streamlit re-executes this module on every rerun, so the buckets live in cache_resource
+_read_bucket, _write_bucket = _get_token_buckets()
+_sheets_semaphore = _get_sheets_semaphore()
+
+# Retry budget of the outermost @throttle call on this thread
+_throttle_state = threading.local()
+
+# Sheet values batch-read by prefetch for this script run, by title: (timestamp, values).
+# Each run has its own thread, so sessions never see each other's buffers.
+_prefetch_state = threading.local()
+
+
+def is_quota_error(error: Exception) -> bool:
+    """Check whether an exception is a Sheets 429 (quota exceeded) response"""
+    response = getattr(error, 'response', None)
+    return isinstance(error, gspread.exceptions.APIError) and getattr(response, 'status_code', None) == 429
+
+
+def is_auth_error(error: Exception) -> bool:
+    """Check whether an exception is a Sheets 401/403 response from an expired session"""
+    response = getattr(error, 'response', None)
+    return isinstance(error, gspread.exceptions.APIError) and getattr(response, 'status_code', None) in (401, 403)
+
 
-# Rate limiting decorator
-def rate_limit(delay_seconds: float = 1.0):
-    """Decorator to add delay between API calls for rate limiting"""
+def should_retry_api_error(error: Exception) -> bool:
+    """
+    Check whether a caught exception should be re-raised for @throttle to retry.
+
+    Methods that turn errors into st.error messages call this first, so a 429
+    or an expired session is retried and only reported once retrying is over.
+    """
+    if is_quota_error(error):
+        return getattr(_throttle_state, 'retries_left', 0) > 0
+    if is_auth_error(error):
+        return getattr(_throttle_state, 'can_reconnect', False)
+    return False
+
+
+def throttle(bucket: TokenBucket, max_retries: int = 4, base_delay: float = 1.0, max_delay: float = 10.0):
+    """
+    Decorator that takes a token per API call and retries recoverable API errors.
+
+    The outermost throttled call on a thread holds a slot of the shared
+    semaphore, bounding concurrent requests. 429 responses are retried with
+    exponential backoff capped at max_delay. A 401/403 is retried once after
+    re-authenticating the GoogleSheetsManager passed as the first argument
+    (or held by it as sheets_manager). Nested throttled calls run inside the
+    outer call's slot without retrying, so their errors reach the outer call
+    and a 429 is retried once for the whole operation.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if hasattr(wrapper, '_last_call'):
-                time_since_last = time.time() - wrapper._last_call
-                if time_since_last < delay_seconds:
-                    time.sleep(delay_seconds - time_since_last)
+            if getattr(_throttle_state, 'in_flight', False):
+                bucket.acquire()
+                return func(*args, **kwargs)
             
-            result = func(*args, **kwargs)
-            wrapper._last_call = time.time()
-            return result
+            manager = getattr(args[0], 'sheets_manager', args[0]) if args else None
+            can_reconnect = hasattr(manager, 'initialize_connection')
+            attempt = 0
+            try:
+                while True:
+                    bucket.acquire()
+                    _throttle_state.retries_left = max_retries - attempt
+                    _throttle_state.can_reconnect = can_reconnect
+                    _sheets_semaphore.acquire()
+                    _throttle_state.in_flight = True
+                    try:
+                        return func(*args, **kwargs)
+                    except gspread.exceptions.APIError as e:
+                        if is_auth_error(e) and can_reconnect:
+                            can_reconnect = False
+                            if manager.initialize_connection():
+                                continue
+                            raise
+                        if not is_quota_error(e) or attempt == max_retries:
+                            raise
+                    finally:
+                        _throttle_state.in_flight = False
+                        _sheets_semaphore.release()
+                    # Capped exponential backoff with jitter, without holding a slot
+                    time.sleep(min(max_delay, base_delay * 2 ** attempt) + random.uniform(0, base_delay))
+                    attempt += 1
+            finally:
+                _throttle_state.retries_left = 0
+                _throttle_state.can_reconnect = False
         return wrapper
     return decorator
 
 
+@st.cache_resource
+def _seeded_spreadsheets() -> set:
+    """Spreadsheets whose admin user is known to exist, shared by every session"""
+    return set()
+
+
 class UserManager:
     """Manages user authentication, roles, and permissions"""
     
@@ -542,46 +672,63 @@ class UserManager:
         }
     }
     
-    def __init__(self, sheets_manager):
-        self.sheets_manager = sheets_manager
+    # Permission sets per role for has_permission
+    _PERMS = {role: frozenset(info['permissions']) for role, info in ROLES.items()}
     
-    def _clear_cache(self, cache_key: str):
-        """Clear cache for a specific key"""
-        if hasattr(self.sheets_manager, '_clear_cache'):
-            self.sheets_manager._clear_cache(cache_key)
+    # Display name per role, for labelling many rows at once
+    ROLE_NAMES = {role: info['name'] for role, info in ROLES.items()}
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cache is valid"""
-        if hasattr(self.sheets_manager, '_is_cache_valid'):
-            return self.sheets_manager._is_cache_valid(cache_key)
-        return False
+    # Users worksheet layout; kdf_version was added after the first release,
+    # so older sheets may only have the first ten columns
+    USER_COLUMNS = ['username', 'password_hash', 'salt', 'role', 'full_name',
+                    'email', 'created_date', 'last_login', 'is_active', 'must_change_password',
+                    'kdf_version']
+
+    # Password hashing schemes
+    KDF_VERSION = 'scrypt'
+    LEGACY_KDF_VERSION = 'sha256'
+    SCRYPT_PARAMS = {'n': 2**15, 'r': 8, 'p': 1, 'dklen': 32, 'maxmem': 64 * 1024 * 1024}
     
-    def _get_cache(self, cache_key: str):
-        """Get cached data"""
-        if hasattr(self.sheets_manager, '_get_cache'):
-            return self.sheets_manager._get_cache(cache_key)
-        return None
+    # Sheet column numbers of the fields update_user_fields may change
+    EDITABLE_USER_COLUMNS = {'role': 4, 'full_name': 5, 'email': 6, 'last_login': 8,
+                             'is_active': 9, 'must_change_password': 10}
+    
+    # Sheet values read as True in boolean columns
+    TRUTHY_VALUES = {'true', '1', 'yes'}
     
-    def _set_cache(self, cache_key: str, data):
-        """Set cache data"""
-        if hasattr(self.sheets_manager, '_set_cache'):
-            self.sheets_manager._set_cache(cache_key, data)
+    # Minimum gap between last_login writes for the same user
+    LAST_LOGIN_DEBOUNCE_SECONDS = 60
+    
+    def __init__(self, sheets_manager):
+        self.sheets_manager = sheets_manager
+        self._kdf_column_ready = False
+        self._seeded = False  # True once the admin user is known to exist
     
     @staticmethod
     def hash_password(password: str, salt: str = None) -> Tuple[str, str]:
-        """Hash a password with a salt"""
+        """Hash a password with a salt using scrypt"""
         if salt is None:
             salt = secrets.token_hex(32)
         
-        # Create hash using password + salt
-        password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
+        password_hash = hashlib.scrypt(
+            password.encode(), salt=bytes.fromhex(salt), **UserManager.SCRYPT_PARAMS
+        ).hex()
         return password_hash, salt
     
     @staticmethod
-    def verify_password(password: str, hashed_password: str, salt: str) -> bool:
-        """Verify a password against its hash"""
-        test_hash, _ = UserManager.hash_password(password, salt)
-        return test_hash == hashed_password
+    def _legacy_hash_password(password: str, salt: str) -> str:
+        """Single-round SHA-256 hash used before scrypt was introduced"""
+        return hashlib.sha256((password + salt).encode()).hexdigest()
+    
+    @staticmethod
+    def verify_password(password: str, hashed_password: str, salt: str,
+                        kdf_version: str = KDF_VERSION) -> bool:
+        """Verify a password against its hash in constant time"""
+        if kdf_version == UserManager.LEGACY_KDF_VERSION:
+            test_hash = UserManager._legacy_hash_password(password, salt)
+        else:
+            test_hash, _ = UserManager.hash_password(password, salt)
+        return hmac.compare_digest(test_hash, str(hashed_password))
 
     @staticmethod
     def generate_username(full_name: str, existing_usernames: list = None) -> str:
@@ -639,6 +786,10 @@ class UserManager:
     def create_default_admin(self):
         """Create default admin user if no users exist"""
         try:
+            spreadsheet_key = self.sheets_manager.get_spreadsheet_key()
+            if self._seeded or spreadsheet_key in _seeded_spreadsheets():
+                return False
+            
             users_df = self.load_users()
             
             # Check if users table is truly empty AND no admin user exists
@@ -658,147 +809,181 @@ class UserManager:
                         'created_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                         'last_login': '',
                         'is_active': True,
-                        'must_change_password': True
+                        'must_change_password': True,
+                        'kdf_version': self.KDF_VERSION
                     }
                     
-                    self.save_user(default_admin)
+                    if self.save_users([default_admin]):
+                        self._seeded = True
+                        _seeded_spreadsheets().add(spreadsheet_key)
                     return True
+            else:
+                self._seeded = True
+                _seeded_spreadsheets().add(spreadsheet_key)
         except Exception as e:
             # Silently handle errors to prevent login disruption
             pass
         
         return False
     
-    @rate_limit(1.0)
-    def load_users(self) -> pd.DataFrame:
-        """Load users from Google Sheets"""
-        cache_key = "load_users"
-
-        if self._is_cache_valid(cache_key):
-            return self._get_cache(cache_key)
-
-        # Ensure Google Sheets connection is established
-        if not self.sheets_manager.spreadsheet:
-            if not self.sheets_manager.ensure_connection():
-                raise Exception("Failed to connect to Google Sheets")
-
+    def _load_users_with_index(self) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """Load users together with the username -> sheet row map"""
         try:
-            # Get or create users worksheet
-            try:
-                worksheet = self.sheets_manager.spreadsheet.worksheet("Users")
-            except:
-                worksheet = self.sheets_manager.spreadsheet.add_worksheet(title="Users", rows=1000, cols=10)
-                # Add headers
-                headers = ['username', 'password_hash', 'salt', 'role', 'full_name', 
-                          'email', 'created_date', 'last_login', 'is_active', 'must_change_password']
-                worksheet.append_row(headers)
-            
-            # Get all records
-            records = worksheet.get_all_records()
-            
-            if not records:
-                users_df = pd.DataFrame(columns=['username', 'password_hash', 'salt', 'role', 'full_name', 
-                                               'email', 'created_date', 'last_login', 'is_active', 'must_change_password'])
-            else:
-                users_df = pd.DataFrame(records)
-                # Convert boolean columns properly
-                if 'is_active' in users_df.columns:
-                    users_df['is_active'] = users_df['is_active'].apply(lambda x: str(x).lower() in ['true', '1', 'yes'] if x != '' else True)
-                if 'must_change_password' in users_df.columns:
-                    users_df['must_change_password'] = users_df['must_change_password'].apply(lambda x: str(x).lower() in ['true', '1', 'yes'] if x != '' else False)
-            
-            self._set_cache(cache_key, users_df)
-            return users_df
-            
+            return _fetch_users(self.sheets_manager, self.sheets_manager.get_spreadsheet_key())
         except Exception as e:
             st.error(f"Error loading users: {str(e)}")
-            return pd.DataFrame()
+            return pd.DataFrame(), {}
+    
+    def load_users(self, use_cache: bool = True) -> pd.DataFrame:
+        """Load users from Google Sheets with caching"""
+        if not use_cache:
+            self._clear_users_cache()
+        
+        users_df, _ = self._load_users_with_index()
+        return users_df
+    
+    def _get_user_row(self, username: str) -> Optional[int]:
+        """Get a user's sheet row number from the cached row index"""
+        _, row_index = self._load_users_with_index()
+        return row_index.get(username)
+    
+    def get_cached_user(self, username: str) -> Optional[dict]:
+        """
+        Look up a user in the cached users frame via the row index.
+
+        Returns the same dict shape as fetch_user, including 'row_number',
+        or None if the user does not exist.
+        """
+        users_df, row_index = self._load_users_with_index()
+        row = row_index.get(username)
+        if row is None:
+            return None
+        
+        # Sheet row 2 is the frame's first row
+        user_data = users_df.iloc[row - 2].to_dict()
+        user_data['row_number'] = row
+        return user_data
+    
+    def _clear_users_cache(self):
+        """Drop cached users and their row positions after a write"""
+        _fetch_users.clear()
+    
+    def _ensure_kdf_column(self, worksheet):
+        """Add the kdf_version column to Users sheets created before it existed"""
+        if self._kdf_column_ready:
+            return
+        
+        kdf_col = self.USER_COLUMNS.index('kdf_version') + 1
+        if worksheet.col_count < kdf_col:
+            worksheet.add_cols(kdf_col - worksheet.col_count)
+        if 'kdf_version' not in worksheet.row_values(1):
+            worksheet.update_cell(1, kdf_col, 'kdf_version')
+            _fetch_user_headers.clear()
+        self._kdf_column_ready = True
     
-    @rate_limit(2.0)
     def save_user(self, user_data: dict) -> bool:
         """Save a single user to Google Sheets"""
+        return self.save_users([user_data])
+    
+    @throttle(_write_bucket)
+    def save_users(self, users: List[dict]) -> bool:
+        """Append several users to Google Sheets in a single API call"""
+        if not users:
+            return True
+        
         try:
-            worksheet = self.sheets_manager.spreadsheet.worksheet("Users")
+            worksheet = self.sheets_manager.ws("Users")
+            self._ensure_kdf_column(worksheet)
             
-            # Convert user data to list for appending
-            user_row = [
-                user_data.get('username', ''),
-                user_data.get('password_hash', ''),
-                user_data.get('salt', ''),
-                user_data.get('role', ''),
-                user_data.get('full_name', ''),
-                user_data.get('email', ''),
-                user_data.get('created_date', ''),
-                user_data.get('last_login', ''),
-                user_data.get('is_active', True),
-                user_data.get('must_change_password', False)
+            # Convert user data to rows for appending
+            rows = [
+                [
+                    user_data.get('username', ''),
+                    user_data.get('password_hash', ''),
+                    user_data.get('salt', ''),
+                    user_data.get('role', ''),
+                    user_data.get('full_name', ''),
+                    user_data.get('email', ''),
+                    user_data.get('created_date', ''),
+                    user_data.get('last_login', ''),
+                    user_data.get('is_active', True),
+                    user_data.get('must_change_password', False),
+                    user_data.get('kdf_version', self.KDF_VERSION)
+                ]
+                for user_data in users
             ]
             
-            worksheet.append_row(user_row)
+            worksheet.append_rows(rows, value_input_option='RAW')
             
             # Clear cache to force reload
-            self._clear_cache("load_users")
+            self._clear_users_cache()
             
             return True
             
         except Exception as e:
+            if should_retry_api_error(e):
+                raise
             st.error(f"Error saving user: {str(e)}")
             return False
     
-    @rate_limit(2.0)
-    def update_user_role(self, username: str, new_role: str) -> bool:
-        """Update a user's role"""
+    @throttle(_write_bucket)
+    def update_user_fields(self, username: str, **fields) -> bool:
+        """Update several columns of a user's row in a single API call"""
+        unknown = set(fields) - set(self.EDITABLE_USER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot update user fields: {', '.join(sorted(unknown))}")
+        
+        if not fields:
+            return True
+        
         try:
-            worksheet = self.sheets_manager.spreadsheet.worksheet("Users")
-            users_data = worksheet.get_all_records()
+            row = self._get_user_row(username)
+            if row is None:
+                return False
             
-            for i, user_record in enumerate(users_data, start=2):
-                if user_record['username'] == username:
-                    # Update role column (column 4)
-                    worksheet.update_cell(i, 4, new_role)
-                    
-                    # Clear cache to force reload
-                    self._clear_cache("load_users")
-                    return True
+            worksheet = self.sheets_manager.ws("Users")
+            # The cached row may belong to another user by now, so confirm it before writing
+            if worksheet.cell(row, 1).value != username:
+                self._clear_users_cache()
+                st.error("User list changed since it was loaded, please try again")
+                return False
             
-            return False
+            data = [
+                {'range': gspread.utils.rowcol_to_a1(row, self.EDITABLE_USER_COLUMNS[field]), 'values': [[value]]}
+                for field, value in fields.items()
+            ]
+            
+            worksheet.batch_update(data, value_input_option='USER_ENTERED')
+            
+            # Clear cache to force reload
+            self._clear_users_cache()
+            return True
             
         except Exception as e:
-            st.error(f"Error updating user role: {str(e)}")
+            if should_retry_api_error(e):
+                raise
+            st.error(f"Error updating user: {str(e)}")
             return False
     
-    @rate_limit(2.0)
+    def update_user_role(self, username: str, new_role: str) -> bool:
+        """Update a user's role"""
+        return self.update_user_fields(username, role=new_role)
+    
     def toggle_user_active(self, username: str) -> bool:
         """Toggle user active status"""
-        try:
-            worksheet = self.sheets_manager.spreadsheet.worksheet("Users")
-            users_data = worksheet.get_all_records()
-            
-            for i, user_record in enumerate(users_data, start=2):
-                if user_record['username'] == username:
-                    current_status = str(user_record.get('is_active', 'True')).lower() in ['true', '1', 'yes']
-                    new_status = not current_status
-                    
-                    # Update is_active column (column 9)
-                    worksheet.update_cell(i, 9, new_status)
-                    
-                    # Clear cache to force reload
-                    self._clear_cache("load_users")
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            st.error(f"Error toggling user status: {str(e)}")
+        user_data = self.get_cached_user(username)
+        if user_data is None:
             return False
+        
+        current_status = bool(user_data['is_active'])
+        return self.update_user_fields(username, is_active=not current_status)
     
-    @rate_limit(2.0)
+    @throttle(_write_bucket)
     def delete_user(self, username: str) -> bool:
         """Delete a user (cannot delete super_admin users if they're the last one)"""
         try:
-            # Clear cache and load current users
-            self._clear_cache("load_users")
-            users_df = self.load_users()
+            # Reuse the cached users and row index; writes always clear them
+            users_df, row_index = self._load_users_with_index()
             
             # Find user to delete
             user_to_delete = users_df[users_df['username'] == username]
@@ -814,46 +999,95 @@ class UserManager:
                     return False
             
             # Delete from spreadsheet
-            worksheet = self.sheets_manager.spreadsheet.worksheet("Users")
-            users_data = worksheet.get_all_records()
+            row = row_index.get(username)
+            if row is None:
+                return False
             
-            for i, user_record in enumerate(users_data, start=2):
-                if user_record['username'] == username:
-                    worksheet.delete_rows(i)
-                    
-                    # Clear cache to force reload
-                    self._clear_cache("load_users")
-                    return True
+            worksheet = self.sheets_manager.ws("Users")
+            # Deleting the wrong row cannot be undone, so confirm the cached row first
+            if worksheet.cell(row, 1).value != username:
+                self._clear_users_cache()
+                st.error("User list changed since it was loaded, please try again")
+                return False
+            worksheet.delete_rows(row)
             
-            return False
+            # Rows below the deleted one have shifted, so drop the row index too
+            self._clear_users_cache()
+            return True
             
         except Exception as e:
+            if should_retry_api_error(e):
+                raise
             st.error(f"Error deleting user: {str(e)}")
             return False
     
+    @throttle(_read_bucket)
+    def fetch_user(self, username: str) -> Optional[dict]:
+        """
+        Fetch a single user's current row.
+
+        The row comes from the cached users index and is read fresh with one
+        request, confirming it still holds the user. Users missing from the
+        index, or whose row has shifted, are looked up in column A instead.
+        Returns the row as a dict with the same normalized values as load_users,
+        plus 'row_number' (its sheet row), or None if the user does not exist.
+        """
+        try:
+            worksheet = self.sheets_manager.ws("Users")
+            row = self._get_user_row(username)
+            values = worksheet.row_values(row) if row is not None else []
+            if not values or values[0] != username:
+                if row is not None:
+                    # The cached index is out of date for everyone, not just this login
+                    self._clear_users_cache()
+                usernames = worksheet.col_values(1)[1:]
+                if username not in usernames:
+                    return None
+                # Row 1 holds the headers
+                row = usernames.index(username) + 2
+                values = worksheet.row_values(row)
+            
+            headers = _fetch_user_headers(self.sheets_manager, self.sheets_manager.get_spreadsheet_key())
+            values += [''] * (len(headers) - len(values))
+            user_data = dict(zip(headers, values))
+            
+            # Normalize the same way _fetch_users does
+            is_active = str(user_data.get('is_active', '')).strip().lower()
+            user_data['is_active'] = is_active == '' or is_active in self.TRUTHY_VALUES
+            user_data['must_change_password'] = (
+                str(user_data.get('must_change_password', '')).strip().lower() in self.TRUTHY_VALUES
+            )
+            user_data['kdf_version'] = user_data.get('kdf_version') or self.LEGACY_KDF_VERSION
+            user_data['row_number'] = row
+            return user_data
+            
+        except Exception as e:
+            if should_retry_api_error(e):
+                raise
+            st.error(f"Error loading user: {str(e)}")
+            return None
+    
     def authenticate_user(self, username: str, password: str) -> Optional[dict]:
         """Authenticate a user and return their data if successful"""
-        users_df = self.load_users()
-        
-        if users_df.empty:
-            return None
+        # Locate the row via the cached users index and read only that row fresh
+        user_data = self.fetch_user(username)
         
-        # Find user
-        user_row = users_df[users_df['username'] == username]
-        
-        if user_row.empty:
+        if user_data is None:
             return None
         
-        user_data = user_row.iloc[0].to_dict()
-        
         # Check if user is active
         if not user_data.get('is_active', False):
             return None
         
         # Verify password
-        if self.verify_password(password, user_data['password_hash'], user_data['salt']):
+        kdf_version = user_data.get('kdf_version', self.LEGACY_KDF_VERSION)
+        if self.verify_password(password, user_data['password_hash'], user_data['salt'], kdf_version):
+            # Transparently move legacy SHA-256 hashes to scrypt
+            if kdf_version != self.KDF_VERSION:
+                self.upgrade_password_hash(username, password, row=user_data['row_number'])
+            
             # Update last login time
-            self.update_last_login(username)
+            self.update_last_login(username, row=user_data['row_number'], last_login=user_data.get('last_login'))
             
             return {
                 'username': user_data['username'],
@@ -865,64 +1099,90 @@ class UserManager:
         
         return None
     
-    def update_last_login(self, username: str):
-        """Update user's last login timestamp"""
+    @throttle(_write_bucket)
+    def upgrade_password_hash(self, username: str, password: str, row: int = None):
+        """Re-hash a verified password with the current KDF"""
         try:
-            worksheet = self.sheets_manager.spreadsheet.worksheet("Users")
-            users_data = worksheet.get_all_records()
+            if row is None:
+                row = self._get_user_row(username)
+            if row is None:
+                return
+            
+            worksheet = self.sheets_manager.ws("Users")
+            # The row may have shifted since it was read, so confirm it before writing
+            if worksheet.cell(row, 1).value != username:
+                self._clear_users_cache()
+                logger.warning("Skipped password hash upgrade for %s: users sheet changed", username)
+                return
+            
+            self._ensure_kdf_column(worksheet)
+            new_hash, new_salt = self.hash_password(password)
+            
+            # Update password hash, salt and kdf version in one request
+            worksheet.batch_update([
+                {'range': f'B{row}:C{row}', 'values': [[new_hash, new_salt]]},  # password_hash, salt columns
+                {'range': f'K{row}', 'values': [[self.KDF_VERSION]]}  # kdf_version column
+            ], value_input_option='USER_ENTERED')
+            
+            # Clear cache
+            self._clear_users_cache()
+            
+        except Exception as e:
+            if should_retry_api_error(e):
+                raise
+            # Keep the legacy hash; the upgrade is retried on next login
+            logger.warning("Password hash upgrade failed for %s: %s", username, e)
+    
+    @throttle(_write_bucket)
+    def update_last_login(self, username: str, row: int = None, last_login: str = None):
+        """Update user's last login timestamp (row/last_login skip the users lookup when known)"""
+        try:
+            # Callers pass a row they have just read; one from the cached index is confirmed below
+            row_from_index = row is None
+            if row_from_index:
+                row = self._get_user_row(username)
+            if row is None:
+                return
+            
+            if last_login is None:
+                users_df = self.load_users()
+                last_login = users_df.loc[users_df['username'] == username, 'last_login'].iloc[0]
+            
+            # Skip the write if this user logged in moments ago (e.g. cookie re-login on rerun)
+            last_login = pd.to_datetime(last_login, errors='coerce')
+            now = datetime.now()
+            if pd.notna(last_login) and (now - last_login).total_seconds() < self.LAST_LOGIN_DEBOUNCE_SECONDS:
+                return
+            
+            worksheet = self.sheets_manager.ws("Users")
+            # The cached row may belong to another user by now, so confirm it before writing
+            if row_from_index and worksheet.cell(row, 1).value != username:
+                self._clear_users_cache()
+                return
+            
+            # Update last login timestamp
+            worksheet.update_cell(row, 8, now.strftime('%Y-%m-%d %H:%M:%S'))
             
-            for i, user in enumerate(users_data, start=2):  # Start at row 2 (after headers)
-                if user['username'] == username:
-                    # Update last login timestamp
-                    worksheet.update_cell(i, 8, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-                    break
-                    
             # Clear cache
-            self._clear_cache("load_users")
+            self._clear_users_cache()
             
         except Exception as e:
+            if should_retry_api_error(e):
+                raise
             pass  # Silently fail for login timestamp updates
     
     def has_permission(self, user_role: str, permission: str) -> bool:
         """Check if a user role has a specific permission"""
-        if user_role not in self.ROLES:
+        role_permissions = self._PERMS.get(user_role)
+        if not role_permissions:
             return False
         
-        role_permissions = self.ROLES[user_role]['permissions']
-        
         # Super admin has all permissions
-        if 'all' in role_permissions:
-            return True
-        
-        return permission in role_permissions
+        return 'all' in role_permissions or permission in role_permissions
     
     def get_user_role_info(self, role: str) -> dict:
         """Get role information"""
         return self.ROLES.get(role, {})
-    
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cache entry is still valid"""
-        if cache_key not in self.sheets_manager.cache:
-            return False
-        
-        cached_time, _ = self.sheets_manager.cache[cache_key]
-        return time.time() - cached_time < self.sheets_manager.cache_timeout
-    
-    def _get_cache(self, cache_key: str):
-        """Get data from cache"""
-        if cache_key in self.sheets_manager.cache:
-            _, data = self.sheets_manager.cache[cache_key]
-            return data
-        return None
-    
-    def _set_cache(self, cache_key: str, data):
-        """Set data in cache"""
-        self.sheets_manager.cache[cache_key] = (time.time(), data)
-    
-    def _clear_cache(self, cache_key: str):
-        """Clear specific cache entry"""
-        if cache_key in self.sheets_manager.cache:
-            del self.sheets_manager.cache[cache_key]
 
 
 # Helper function for phone number formatting
@@ -956,36 +1216,284 @@ def format_phone_number(phone_value):
     return phone_str
 
 
+def _format_phone_series(phones: pd.Series) -> pd.Series:
+    """
+    Vectorized format_phone_number for a whole Phone column.
+
+    Args:
+        phones: Series of phone numbers (strings, ints, floats or missing values)
+
+    Returns:
+        pd.Series: Formatted phone numbers as strings
+    """
+    formatted = phones.astype(str).str.strip().mask(phones.isna(), '')
+    formatted = formatted.str.replace(r'\.0$', '', regex=True)
+    nine_digits = formatted.str.fullmatch(r'\d{9}')
+    return formatted.mask(nine_digits, '0' + formatted)
+
+
+# Engagement buckets by attendance rate; each bin includes its lower edge
+ENGAGEMENT_BINS = [-np.inf, 25, 50, 80, np.inf]
+ENGAGEMENT_LABELS = ["Low Engagement (<25%)", "Occasionally Engaged (25-49%)",
+                     "Moderately Engaged (50-79%)", "Highly Engaged (80%+)"]
+
+
+def _engagement_level_series(rates: pd.Series) -> pd.Series:
+    """
+    Vectorized engagement level for a Series of attendance rates (percent).
+
+    Args:
+        rates: Attendance rates as percentages
+
+    Returns:
+        pd.Series: Engagement level labels as strings
+    """
+    levels = pd.cut(rates, bins=ENGAGEMENT_BINS, labels=ENGAGEMENT_LABELS, right=False)
+    return levels.fillna(ENGAGEMENT_LABELS[0]).astype(str)
+
+
+# Weekday names in dt.dayofweek order (Monday=0)
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _weekday_counts(dates: pd.Series) -> pd.Series:
+    """
+    Count dates per weekday by binning weekday numbers, not grouping day names.
+
+    Args:
+        dates: Series of datetime64 values (missing dates are ignored)
+
+    Returns:
+        pd.Series: Counts indexed by day name in Monday..Sunday order, days with no dates omitted
+    """
+    weekdays = dates.dropna().dt.dayofweek.to_numpy(dtype='int64')
+    counts = pd.Series(np.bincount(weekdays, minlength=7), index=DAY_NAMES)
+    return counts[counts > 0]
+
+
+def _daily_counts(dates: pd.Series) -> pd.Series:
+    """
+    Count records per calendar day with a daily resample.
+
+    Args:
+        dates: Series of datetime64 values (missing dates are ignored)
+
+    Returns:
+        pd.Series: Counts indexed by day (named 'Date'), only days that have records
+    """
+    dates = dates.dropna()
+    if dates.empty:
+        return pd.Series(dtype='int64', index=pd.DatetimeIndex([], name='Date'))
+    counts = dates.to_frame('Date').resample('D', on='Date').size()
+    return counts[counts > 0]
+
+
+# Attendance worksheet layout
+ATTENDANCE_COLUMNS = ['Date', 'Membership Number', 'Full Name', 'Group', 'Status', 'Timestamp']
+
+# Columns that drive duplicate detection, group filters and orphan checks
+ARROW_STRING_COLUMNS = ['Full Name', 'Group']
+
+
+def to_arrow_strings(df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Cast string key columns to the pyarrow-backed string dtype.
+
+    duplicated/isin/isna/unique on these columns then run on Arrow kernels
+    instead of hashing Python str objects row by row. Falls back to the
+    original dtype if pyarrow is unavailable.
+    """
+    columns = [col for col in (columns or ARROW_STRING_COLUMNS) if col in df.columns]
+    if df.empty or not columns:
+        return df
+
+    try:
+        df[columns] = df[columns].astype('string[pyarrow]')
+    except (ImportError, TypeError, ValueError):
+        pass
+
+    return df
+
+
+def read_members_csv(uploaded_file) -> pd.DataFrame:
+    """
+    Read an uploaded members CSV with the multithreaded pyarrow parser.
+
+    Falls back to the default C parser if pyarrow is unavailable or rejects
+    the file, so malformed uploads still get pandas' usual error message.
+    """
+    try:
+        return pd.read_csv(uploaded_file, engine='pyarrow')
+    except (ImportError, ValueError):
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+@throttle(_read_bucket)
+def _fetch_users(_sheets_manager, spreadsheet_key: str) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Fetch the Users sheet and the username -> sheet row map.
+
+    Cached process-wide, so every session and rerun shares one copy until the
+    TTL expires or a write calls _fetch_users.clear().
+    """
+    # Ensure Google Sheets connection is established
+    if not _sheets_manager.spreadsheet:
+        if not _sheets_manager.ensure_connection():
+            raise Exception("Failed to connect to Google Sheets")
+
+    # Get or create users worksheet
+    try:
+        worksheet = _sheets_manager.ws("Users")
+    except:
+        worksheet = _sheets_manager.spreadsheet.add_worksheet(title="Users", rows=1000, cols=len(UserManager.USER_COLUMNS))
+        # Add headers
+        worksheet.append_row(UserManager.USER_COLUMNS)
+        _sheets_manager._worksheets["Users"] = worksheet
+
+    # Get all values; the first row holds the headers
+    values = worksheet.get_all_values()
+
+    if len(values) <= 1:
+        return pd.DataFrame(columns=UserManager.USER_COLUMNS), {}
+
+    users_df = pd.DataFrame(values[1:], columns=values[0])
+    # Convert boolean columns properly
+    truthy = UserManager.TRUTHY_VALUES
+    if 'is_active' in users_df.columns:
+        is_active = users_df['is_active'].str.strip().str.lower()
+        users_df['is_active'] = (is_active == '') | is_active.isin(truthy)
+    if 'must_change_password' in users_df.columns:
+        users_df['must_change_password'] = users_df['must_change_password'].str.strip().str.lower().isin(truthy)
+    # Rows written before kdf_version existed use the legacy hash
+    if 'kdf_version' not in users_df.columns:
+        users_df['kdf_version'] = UserManager.LEGACY_KDF_VERSION
+    else:
+        users_df['kdf_version'] = users_df['kdf_version'].replace('', UserManager.LEGACY_KDF_VERSION)
+    # Sheet row of each user (row 1 holds the headers); first match wins like the old scans
+    row_index = {}
+    for i, username in enumerate(users_df['username'], start=2):
+        row_index.setdefault(username, i)
+
+    return users_df, row_index
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+@throttle(_read_bucket)
+def _fetch_user_headers(_sheets_manager, spreadsheet_key: str) -> List[str]:
+    """Fetch the Users header row, which only changes when a column is added"""
+    return _sheets_manager.ws("Users").row_values(1)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+@throttle(_read_bucket)
+def _fetch_members(_sheets_manager, spreadsheet_key: str) -> pd.DataFrame:
+    """
+    Fetch and clean the Members sheet.
+
+    Cached process-wide like _fetch_users; writes call _fetch_members.clear().
+    """
+    # Ensure connection is active
+    if not _sheets_manager.ensure_connection():
+        raise Exception("Unable to connect to Google Sheets")
+
+    _sheets_manager.note_cache_load('Members')
+
+    # Use the login-time batch read if there is one
+    values = _sheets_manager.take_prefetched('Members')
+    if values is None:
+        values = _sheets_manager.ws('Members').get_all_values()
+    df = pd.DataFrame(values[1:], columns=values[0]) if values else pd.DataFrame()
+
+    # Clean data
+    if not df.empty:
+        df = df.fillna('')
+        # Ensure required columns exist
+        required_cols = ['Membership Number', 'Full Name', 'Group', 'Email', 'Phone']
+        for col in required_cols:
+            if col not in df.columns:
+                df[col] = ''
+
+        # Ensure Phone column is stored as string to preserve leading zeros
+        if 'Phone' in df.columns:
+            df['Phone'] = _format_phone_series(df['Phone'])
+
+        df = to_arrow_strings(df)
+
+    return df
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+@throttle(_read_bucket)
+def _fetch_attendance(_sheets_manager, spreadsheet_key: str) -> Tuple[pd.DataFrame, Dict[Tuple[str, str, str], int]]:
+    """
+    Fetch and clean the Attendance sheet.
+
+    Also returns the sheet row of each (Date, Full Name, Timestamp) key, so
+    updates and deletes can address rows without rescanning the sheet.
+    Writes call _fetch_attendance.clear().
+    """
+    # Ensure connection is active
+    if not _sheets_manager.ensure_connection():
+        raise Exception("Unable to connect to Google Sheets")
+
+    _sheets_manager.note_cache_load('Attendance')
+
+    # Use the login-time batch read if there is one
+    values = _sheets_manager.take_prefetched('Attendance')
+    if values is None:
+        values = _sheets_manager.ws('Attendance').get_all_values()
+    df = pd.DataFrame(values[1:], columns=values[0]) if values else pd.DataFrame()
+
+    # Sheet row of each record (row 1 holds the headers); first match wins like the old scan
+    row_index = {}
+    key_columns = [df[col] if col in df.columns else [''] * len(df) for col in ('Date', 'Full Name', 'Timestamp')]
+    for i, key in enumerate(zip(*key_columns), start=2):
+        row_index.setdefault(key, i)
+
+    if not df.empty:
+        df = df.fillna('')
+        # Convert date column to datetime
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+        df = to_arrow_strings(df)
+
+    return df, row_index
+
+
+@st.cache_resource
+def _get_credentials() -> dict:
+    """Service account credentials from Streamlit secrets, copied once per process"""
+    return dict(st.secrets["google_sheets"])
+
+
 class GoogleSheetsManager:
     """Central manager for all Google Sheets operations with caching and rate limiting"""
     
     def __init__(self):
         self.client = None
         self.spreadsheet = None
-        self.cache = {}
-        self.cache_timeout = 300  # 5 minutes
+        self.cache_timeout = 300  # 5 minutes, the ttl of the st.cache_data fetchers
+        self.cache_loaded = {}  # Sheet title -> time its st.cache_data entry was filled
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.connection_status = False
         self.connection_timestamp = None
         self.connection_timeout = 3600  # 1 hour before re-authentication
+        self._worksheets = {}  # Worksheet handles by title, reset on reconnect/setup
+        self.prefetch_max_age = 30  # Seconds a prefetched sheet may stand in for a fresh read
         
     def is_connection_valid(self):
         """Check if current connection is still valid"""
         if not self.connection_status or self.client is None or self.spreadsheet is None:
             return False
-            
-        # Check if connection has timed out
-        if self.connection_timestamp:
-            time_since_connection = time.time() - self.connection_timestamp
-            if time_since_connection > self.connection_timeout:
-                return False
         
-        # Test connection with a simple API call
-        try:
-            # Try to access spreadsheet properties (lightweight call)
-            _ = self.spreadsheet.title
-            return True
-        except Exception:
-            return False
+        # Trust the connection until it times out; an expired session surfaces as
+        # a 401/403 on the real call, where @throttle reconnects and retries
+        time_since_connection = time.time() - (self.connection_timestamp or 0)
+        return time_since_connection < self.connection_timeout
     
     def ensure_connection(self):
         """Ensure connection is active, reconnect if necessary"""
@@ -996,15 +1504,13 @@ class GoogleSheetsManager:
     def initialize_connection(self):
         """Initialize Google Sheets connection using service account credentials"""
         try:
-            # Get credentials from Streamlit secrets
-            credentials_dict = dict(st.secrets["google_sheets"])
-            
             # Initialize gspread client
-            self.client = gspread.service_account_from_dict(credentials_dict)
+            self.client = gspread.service_account_from_dict(_get_credentials())
             
             # Open spreadsheet
             spreadsheet_name = st.secrets["google_sheets"]["spreadsheet_name"]
             self.spreadsheet = self.client.open(spreadsheet_name)
+            self._worksheets = {}
             
             self.connection_status = True
             self.connection_timestamp = time.time()
@@ -1016,30 +1522,79 @@ class GoogleSheetsManager:
             self.connection_timestamp = None
             return False
     
-    def _get_cache_key(self, method_name: str, *args) -> str:
-        """Generate cache key for method and parameters"""
-        return f"{method_name}_{hash(str(args))}"
-    
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid"""
-        if cache_key not in self.cache:
-            return False
-        
-        cached_time, _ = self.cache[cache_key]
-        return time.time() - cached_time < self.cache_timeout
+    def get_spreadsheet_key(self) -> str:
+        """Identify the configured spreadsheet for process-wide st.cache_data entries"""
+        return st.secrets["google_sheets"]["spreadsheet_name"]
     
-    def _get_cache(self, cache_key: str):
-        """Retrieve data from cache"""
-        _, data = self.cache[cache_key]
-        return data
+    def _cached_fetch(self, fetcher):
+        """Call a st.cache_data fetcher, counting whether it was served from the cache"""
+        misses = self.cache_misses
+        result = fetcher(self, self.get_spreadsheet_key())
+        if self.cache_misses == misses:
+            self.cache_hits += 1
+        return result
     
-    def _set_cache(self, cache_key: str, data):
-        """Store data in cache"""
-        self.cache[cache_key] = (time.time(), data)
+    def note_cache_load(self, sheet: str):
+        """Record a cache miss; the fetchers call this only when they actually read the sheet"""
+        self.cache_misses += 1
+        self.cache_loaded[sheet] = time.time()
     
     def clear_cache(self):
         """Clear all cached data"""
-        self.cache = {}
+        self.cache_loaded = {}
+        _prefetch_state.sheets = {}
+        _fetch_members.clear()
+        _fetch_attendance.clear()
+        _fetch_users.clear()
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters for the sheet caches"""
+        now = time.time()
+        entries = sum(now - loaded_at < self.cache_timeout for loaded_at in self.cache_loaded.values())
+        return {'hits': self.cache_hits, 'misses': self.cache_misses, 'entries': entries}
+    
+    def ws(self, name: str):
+        """Get a worksheet handle, looking it up only on first use"""
+        if name not in self._worksheets:
+            self._worksheets[name] = self.spreadsheet.worksheet(name)
+        return self._worksheets[name]
+    
+    @throttle(_read_bucket)
+    def batch_load(self, sheet_names: List[str]) -> Dict[str, List[List[str]]]:
+        """Read several whole worksheets with a single values.batchGet request"""
+        if not self.ensure_connection():
+            raise Exception("Unable to connect to Google Sheets")
+        
+        response = self.spreadsheet.values_batch_get([f"'{name}'" for name in sheet_names])
+        
+        sheets = {}
+        for name, value_range in zip(sheet_names, response.get('valueRanges', [])):
+            values = value_range.get('values', [])
+            # The API trims trailing empty cells; pad rows to the header width like get_all_values
+            width = max((len(row) for row in values), default=0)
+            sheets[name] = [row + [''] * (width - len(row)) for row in values]
+        return sheets
+    
+    def prefetch(self, sheet_names: List[str]):
+        """Batch-read sheets so the next loaders on cold caches skip their own requests"""
+        # Sheets whose st.cache_data entry is still warm are served without a request
+        now = time.time()
+        cold = [name for name in sheet_names if now - self.cache_loaded.get(name, 0) >= self.cache_timeout]
+        if not cold:
+            return
+        
+        try:
+            _prefetch_state.sheets = {name: (now, values) for name, values in self.batch_load(cold).items()}
+        except Exception:
+            pass  # Each loader falls back to its own read
+    
+    def take_prefetched(self, sheet_name: str) -> Optional[List[List[str]]]:
+        """Hand out values prefetched in this script run once, if they are still fresh"""
+        prefetched = getattr(_prefetch_state, 'sheets', {})
+        loaded_at, values = prefetched.pop(sheet_name, (0, None))
+        if time.time() - loaded_at > self.prefetch_max_age:
+            return None
+        return values
     
     def setup_worksheets(self):
         """Create required worksheets if they don't exist"""
@@ -1051,15 +1606,26 @@ class GoogleSheetsManager:
         try:
             required_sheets = {
                 'Members': ['Membership Number', 'Full Name', 'Group', 'Email', 'Phone'],
-                'Attendance': ['Date', 'Membership Number', 'Full Name', 'Group', 'Status', 'Timestamp']
+                'Attendance': ATTENDANCE_COLUMNS,
+                'Users': UserManager.USER_COLUMNS
             }
             
-            for sheet_name, headers in required_sheets.items():
-                try:
-                    worksheet = self.spreadsheet.worksheet(sheet_name)
-                except gspread.WorksheetNotFound:
-                    worksheet = self.spreadsheet.add_worksheet(title=sheet_name, rows=1000, cols=10)
-                    worksheet.append_row(headers)
+            # One metadata request lists every worksheet and primes the handle cache
+            self._worksheets = {worksheet.title: worksheet for worksheet in self.spreadsheet.worksheets()}
+            missing = {name: headers for name, headers in required_sheets.items() if name not in self._worksheets}
+            
+            if missing:
+                # Add all missing sheets in one batchUpdate, then write their headers in one values call
+                self.spreadsheet.batch_update({'requests': [
+                    {'addSheet': {'properties': {'title': name, 'gridProperties': {'rowCount': 1000, 'columnCount': max(10, len(headers))}}}}
+                    for name, headers in missing.items()
+                ]})
+                self.spreadsheet.values_batch_update({
+                    'valueInputOption': 'RAW',
+                    'data': [{'range': f"'{name}'!A1", 'values': [headers]} for name, headers in missing.items()]
+                })
+                # New sheets are looked up again on first use
+                self._worksheets = {}
                     
             return True
         except Exception as e:
@@ -1068,39 +1634,13 @@ class GoogleSheetsManager:
             self.connection_status = False
             return False
     
-    @rate_limit(1.0)
     def load_members(self, use_cache: bool = True) -> pd.DataFrame:
         """Load members data from Google Sheets with caching"""
-        cache_key = self._get_cache_key("load_members")
-        
-        if use_cache and self._is_cache_valid(cache_key):
-            return self._get_cache(cache_key)
-        
-        # Ensure connection is active
-        if not self.ensure_connection():
-            st.error("Unable to connect to Google Sheets")
-            return pd.DataFrame()
+        if not use_cache:
+            _fetch_members.clear()
         
         try:
-            worksheet = self.spreadsheet.worksheet('Members')
-            data = worksheet.get_all_records()
-            df = pd.DataFrame(data)
-            
-            # Clean data
-            if not df.empty:
-                df = df.fillna('')
-                # Ensure required columns exist
-                required_cols = ['Membership Number', 'Full Name', 'Group', 'Email', 'Phone']
-                for col in required_cols:
-                    if col not in df.columns:
-                        df[col] = ''
-
-                # Ensure Phone column is stored as string to preserve leading zeros
-                if 'Phone' in df.columns:
-                    df['Phone'] = df['Phone'].apply(format_phone_number)
-            
-            self._set_cache(cache_key, df)
-            return df
+            return self._cached_fetch(_fetch_members)
             
         except Exception as e:
             st.error(f"Failed to load members: {str(e)}")
@@ -1108,7 +1648,7 @@ class GoogleSheetsManager:
             self.connection_status = False
             return pd.DataFrame()
     
-    @rate_limit(2.0)
+    @throttle(_write_bucket)
     def save_members(self, df: pd.DataFrame) -> bool:
         """Save members data to Google Sheets"""
         # Ensure connection is active
@@ -1117,68 +1657,90 @@ class GoogleSheetsManager:
             return False
             
         try:
-            worksheet = self.spreadsheet.worksheet('Members')
-            
-            # Clear existing data (except headers)
-            worksheet.clear()
+            worksheet = self.ws('Members')
             
-            # Set headers
             headers = ['Membership Number', 'Full Name', 'Group', 'Email', 'Phone']
-            worksheet.append_row(headers)
+            data = []
             
-            # Add data
             if not df.empty:
-                # Ensure all required columns exist
-                for col in headers:
-                    if col not in df.columns:
-                        df[col] = ''
+                # Select the sheet columns, adding any that are missing
+                members = df.reindex(columns=headers, fill_value='')
 
                 # Format phone numbers to preserve leading zeros
-                if 'Phone' in df.columns:
-                    df['Phone'] = df['Phone'].apply(format_phone_number)
+                members['Phone'] = _format_phone_series(members['Phone'])
 
-                # Convert to list of lists
-                data = df[headers].fillna('').values.tolist()
-                
-                # Batch update
-                if data:
-                    worksheet.append_rows(data)
+                # Convert to list of lists, blanking missing values on the way out
+                data = members.to_numpy(dtype=object, na_value='').tolist()
+            
+            # Unlike append_rows, update does not grow the grid. Keep a row spare below the
+            # payload so the clear below always has a range; row_count on the shared handle
+            # can lag rows appended since, which only makes this add a few rows too many
+            payload = [headers] + data
+            if len(payload) >= worksheet.row_count:
+                worksheet.add_rows(len(payload) + 1 - worksheet.row_count)
+            
+            # Overwrite headers and data in one call; RAW keeps leading zeros on phone numbers
+            worksheet.update(range_name='A1', values=payload, value_input_option='RAW')
+            
+            # Remove rows left over from a longer previous save or later appends; always
+            # cleared, since the cached row_count cannot tell whether any are left
+            worksheet.batch_clear([f'A{len(payload) + 1}:Z'])
             
             # Clear cache
             self.clear_cache()
             return True
             
         except Exception as e:
+            if should_retry_api_error(e):
+                raise
             st.error(f"Failed to save members: {str(e)}")
             # Connection might have failed, reset status
             self.connection_status = False
             return False
     
-    @rate_limit(1.0)
-    def load_attendance(self, use_cache: bool = True) -> pd.DataFrame:
-        """Load attendance data from Google Sheets with caching"""
-        cache_key = self._get_cache_key("load_attendance")
-        
-        if use_cache and self._is_cache_valid(cache_key):
-            return self._get_cache(cache_key)
-        
+    def append_member(self, member: Dict) -> bool:
+        """Append a single member row to Google Sheets without rewriting the sheet"""
+        return self.append_members(pd.DataFrame([member]))
+    
+    @throttle(_write_bucket)
+    def append_members(self, df: pd.DataFrame) -> bool:
+        """Append member rows to Google Sheets with a single append_rows call"""
         # Ensure connection is active
         if not self.ensure_connection():
             st.error("Unable to connect to Google Sheets")
-            return pd.DataFrame()
-        
+            return False
+            
         try:
-            worksheet = self.spreadsheet.worksheet('Attendance')
-            data = worksheet.get_all_records()
-            df = pd.DataFrame(data)
+            worksheet = self.ws('Members')
             
-            if not df.empty:
-                df = df.fillna('')
-                # Convert date column to datetime
-                if 'Date' in df.columns:
-                    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+            headers = ['Membership Number', 'Full Name', 'Group', 'Email', 'Phone']
+            members = df.reindex(columns=headers, fill_value='')
+            members['Phone'] = _format_phone_series(members['Phone'])
+            rows = members.to_numpy(dtype=object, na_value='').tolist()
             
-            self._set_cache(cache_key, df)
+            # One append request; RAW keeps leading zeros on phone numbers
+            if rows:
+                worksheet.append_rows(rows, value_input_option='RAW')
+            
+            # Clear cache
+            self.clear_cache()
+            return True
+            
+        except Exception as e:
+            if should_retry_api_error(e):
+                raise
+            st.error(f"Failed to add members: {str(e)}")
+            # Connection might have failed, reset status
+            self.connection_status = False
+            return False
+    
+    def load_attendance(self, use_cache: bool = True) -> pd.DataFrame:
+        """Load attendance data from Google Sheets with caching"""
+        if not use_cache:
+            _fetch_attendance.clear()
+        
+        try:
+            df, _ = self._cached_fetch(_fetch_attendance)
             return df
             
         except Exception as e:
@@ -1187,7 +1749,41 @@ class GoogleSheetsManager:
             self.connection_status = False
             return pd.DataFrame()
     
-    @rate_limit(2.0)
+    @staticmethod
+    def _attendance_key(record: dict) -> Tuple[str, str, str]:
+        """Date, name and timestamp identify an attendance record"""
+        return (str(record.get('Date', '')), str(record.get('Full Name', '')), str(record.get('Timestamp', '')))
+    
+    def _find_attendance_rows(self, worksheet, records: List[dict]) -> Optional[List[int]]:
+        """
+        Find the sheet rows of attendance records via the cached row index.
+
+        The cached rows are confirmed with one batch_get, since another session
+        may have deleted rows since the index was built; on a miss the index is
+        rebuilt once. Returns None if any record cannot be found.
+        """
+        keys = [self._attendance_key(record) for record in records]
+        
+        for refresh in (False, True):
+            if refresh:
+                _fetch_attendance.clear()
+            _, row_index = self._cached_fetch(_fetch_attendance)
+            
+            rows = [row_index.get(key) for key in keys]
+            if None in rows:
+                continue
+            
+            current_rows = worksheet.batch_get([f'A{row}:F{row}' for row in rows])
+            current_keys = []
+            for value_range in current_rows:
+                values = (list(value_range[0]) if value_range else []) + [''] * 6
+                current_keys.append((values[0], values[2], values[5]))
+            if current_keys == keys:
+                return rows
+        
+        return None
+    
+    @throttle(_write_bucket)
     def save_attendance(self, attendance_records: List[Dict]) -> bool:
         """Save attendance records to Google Sheets"""
         # Ensure connection is active
@@ -1196,20 +1792,15 @@ class GoogleSheetsManager:
             return False
             
         try:
-            worksheet = self.spreadsheet.worksheet('Attendance')
+            worksheet = self.ws('Attendance')
             
-            # Prepare data for insertion
+            # Prepare data for insertion; object dtype stops ints becoming floats next to gaps
             rows_to_add = []
-            for record in attendance_records:
-                row = [
-                    record.get('Date', ''),
-                    record.get('Membership Number', ''),
-                    record.get('Full Name', ''),
-                    record.get('Group', ''),
-                    record.get('Status', 'Present'),
-                    record.get('Timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-                ]
-                rows_to_add.append(row)
+            if attendance_records:
+                records_df = pd.DataFrame(attendance_records, dtype=object).reindex(columns=ATTENDANCE_COLUMNS)
+                records_df['Status'] = records_df['Status'].fillna('Present')
+                records_df['Timestamp'] = records_df['Timestamp'].fillna(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                rows_to_add = records_df.fillna('').values.tolist()
             
             # Batch insert
             if rows_to_add:
@@ -1220,85 +1811,135 @@ class GoogleSheetsManager:
             return True
             
         except Exception as e:
+            if should_retry_api_error(e):
+                raise
             st.error(f"Failed to save attendance: {str(e)}")
             # Connection might have failed, reset status
             self.connection_status = False
             return False
     
-    @rate_limit(2.0)
     def update_attendance_record(self, original_record: dict, updated_record: dict) -> bool:
         """Update a specific attendance record"""
+        return self.update_attendance_records([(original_record, updated_record)])
+    
+    @throttle(_write_bucket)
+    def update_attendance_records(self, record_pairs: List[Tuple[dict, dict]]) -> bool:
+        """Update several attendance records with a single batch_update call"""
         # Ensure connection is active
         if not self.ensure_connection():
             st.error("Unable to connect to Google Sheets")
             return False
             
         try:
-            worksheet = self.spreadsheet.worksheet('Attendance')
-            all_records = worksheet.get_all_records()
+            if not record_pairs:
+                return True
             
-            # Find the matching record to update
-            for i, record in enumerate(all_records, start=2):  # Start at 2 to account for headers
-                # Match by date, name, and timestamp for uniqueness
-                if (str(record.get('Date', '')) == str(original_record.get('Date', '')) and
-                    str(record.get('Full Name', '')) == str(original_record.get('Full Name', '')) and
-                    str(record.get('Timestamp', '')) == str(original_record.get('Timestamp', ''))):
-                    
-                    # Update the record
-                    worksheet.update_cell(i, 1, updated_record.get('Date', ''))  # Date
-                    worksheet.update_cell(i, 2, updated_record.get('Membership Number', ''))  # Membership Number
-                    worksheet.update_cell(i, 3, updated_record.get('Full Name', ''))  # Full Name
-                    worksheet.update_cell(i, 4, updated_record.get('Group', ''))  # Group
-                    worksheet.update_cell(i, 5, updated_record.get('Status', 'Present'))  # Status
-                    worksheet.update_cell(i, 6, updated_record.get('Timestamp', ''))  # Timestamp
-                    
-                    # Clear cache
-                    self.clear_cache()
-                    return True
+            worksheet = self.ws('Attendance')
             
-            return False
+            # Match by date, name, and timestamp for uniqueness
+            rows = self._find_attendance_rows(worksheet, [original for original, _ in record_pairs])
+            if rows is None:
+                return False
+            
+            updates = []
+            for i, (_, updated_record) in zip(rows, record_pairs):
+                # Rewrite the whole row (Date through Timestamp) in one range
+                new_row = [
+                    updated_record.get('Date', ''),
+                    updated_record.get('Membership Number', ''),
+                    updated_record.get('Full Name', ''),
+                    updated_record.get('Group', ''),
+                    updated_record.get('Status', 'Present'),
+                    updated_record.get('Timestamp', '')
+                ]
+                updates.append({'range': f'A{i}:F{i}', 'values': [new_row]})
+            
+            if updates:
+                worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+                
+                # Clear cache
+                self.clear_cache()
+            return True
             
         except Exception as e:
+            if should_retry_api_error(e):
+                raise
             st.error(f"Failed to update attendance record: {str(e)}")
             # Connection might have failed, reset status
             self.connection_status = False
             return False
     
-    @rate_limit(2.0)
     def delete_attendance_record(self, record_to_delete: dict) -> bool:
         """Delete a specific attendance record"""
+        return self.delete_attendance_records([record_to_delete])
+    
+    @throttle(_write_bucket)
+    def delete_attendance_records(self, records_to_delete: List[dict]) -> bool:
+        """Delete several attendance records with a single batchUpdate request"""
         # Ensure connection is active
         if not self.ensure_connection():
             st.error("Unable to connect to Google Sheets")
             return False
             
         try:
-            worksheet = self.spreadsheet.worksheet('Attendance')
-            all_records = worksheet.get_all_records()
+            if not records_to_delete:
+                return True
             
-            # Find the matching record to delete
-            for i, record in enumerate(all_records, start=2):  # Start at 2 to account for headers
-                # Match by date, name, and timestamp for uniqueness
-                if (str(record.get('Date', '')) == str(record_to_delete.get('Date', '')) and
-                    str(record.get('Full Name', '')) == str(record_to_delete.get('Full Name', '')) and
-                    str(record.get('Timestamp', '')) == str(record_to_delete.get('Timestamp', ''))):
-                    
-                    # Delete the row
-                    worksheet.delete_rows(i)
-                    
-                    # Clear cache
-                    self.clear_cache()
-                    return True
+            worksheet = self.ws('Attendance')
             
-            return False
+            # Match by date, name, and timestamp for uniqueness
+            rows = self._find_attendance_rows(worksheet, records_to_delete)
+            if rows is None:
+                return False
+            
+            # Delete bottom-up so earlier deletions do not shift the later row numbers
+            requests = [
+                {'deleteDimension': {'range': {'sheetId': worksheet.id, 'dimension': 'ROWS',
+                                               'startIndex': row - 1, 'endIndex': row}}}
+                for row in sorted(set(rows), reverse=True)
+            ]
+            self.spreadsheet.batch_update({'requests': requests})
+            
+            # Clear cache
+            self.clear_cache()
+            return True
             
         except Exception as e:
+            if should_retry_api_error(e):
+                raise
             st.error(f"Failed to delete attendance record: {str(e)}")
             # Connection might have failed, reset status
             self.connection_status = False
             return False
 
 
+@st.cache_resource
+def get_sheets_manager() -> GoogleSheetsManager:
+    """Sheets manager shared by every session, so the client and worksheet handles survive reruns"""
+    return GoogleSheetsManager()
+
+
+@st.cache_resource
+def get_user_manager() -> UserManager:
+    """User manager bound to the shared sheets manager"""
+    return UserManager(get_sheets_manager())
+
+
+def bootstrap(sheets_manager, user_manager) -> bool:
+    """
+    One-time startup work: create missing worksheets and the default admin.
+
+    Skipped once the spreadsheet's admin user is known to exist, so only the
+    first session in the process pays for it.
+    """
+    if sheets_manager.get_spreadsheet_key() in _seeded_spreadsheets():
+        return True
+    if not sheets_manager.setup_worksheets():
+        return False
+    user_manager.create_default_admin()
+    return True
+
+
 def show_login(cookie_manager):
     """Display login interface"""
 
@@ -1347,10 +1988,10 @@ def show_login(cookie_manager):
 
     # Initialize managers if needed
     if 'sheets_manager' not in st.session_state:
-        st.session_state.sheets_manager = GoogleSheetsManager()
+        st.session_state.sheets_manager = get_sheets_manager()
 
     if 'user_manager' not in st.session_state:
-        st.session_state.user_manager = UserManager(st.session_state.sheets_manager)
+        st.session_state.user_manager = get_user_manager()
 
     # Ensure connection (this will connect only if needed)
     if not st.session_state.sheets_manager.ensure_connection():
@@ -1361,17 +2002,15 @@ def show_login(cookie_manager):
             if st.button("🔄 Connect to Google Sheets", use_container_width=True):
                 with st.spinner("Connecting..."):
                     if st.session_state.sheets_manager.initialize_connection():
-                        st.session_state.sheets_manager.setup_worksheets()
-                        # Create default admin if no users exist
-                        st.session_state.user_manager.create_default_admin()
+                        # Create worksheets and the default admin if missing
+                        st.session_state.bootstrapped = bootstrap(st.session_state.sheets_manager, st.session_state.user_manager)
                         st.rerun()
         return
 
-    # Create default admin only if needed (check once per session)
-    if 'admin_check_done' not in st.session_state:
+    # Set up worksheets and the default admin only if needed (once per session)
+    if not st.session_state.get('bootstrapped', False):
         try:
-            st.session_state.user_manager.create_default_admin()
-            st.session_state.admin_check_done = True
+            st.session_state.bootstrapped = bootstrap(st.session_state.sheets_manager, st.session_state.user_manager)
         except:
             pass  # Silently continue if there's an issue
 
@@ -1425,19 +2064,18 @@ def show_login(cookie_manager):
                         # Save authentication cookie if "Remember me" is checked
                         if remember_me:
                             # Get user's password hash for token generation
-                            users_df = st.session_state.user_manager.load_users()
-                            user_row = users_df[users_df['username'] == username]
-                            if not user_row.empty:
-                                password_hash = user_row.iloc[0]['password_hash']
+                            cached_user = st.session_state.user_manager.get_cached_user(username)
+                            if cached_user is not None:
+                                password_hash = cached_user['password_hash']
                                 # Generate secure authentication token
-                                auth_token = hashlib.sha256(f"{username}:{password_hash}".encode()).hexdigest()
+                                auth_token = make_auth_token(username, password_hash)
                                 save_auth_cookie(cookie_manager, username, auth_token, remember_days=30)
-
-                        # Clear the logout marker cookie (allow auto-login for this account now)
-                        try:
-                            cookie_manager.delete('church_att_logged_out')
-                        except:
-                            pass
+                        else:
+                            # Clear the logout marker cookie (remember me replaces it with the session instead)
+                            try:
+                                cookie_manager.delete('church_att_session')
+                            except:
+                                pass
 
                         # Clear the just_logged_out flag if it exists
                         if 'just_logged_out' in st.session_state:
@@ -1458,18 +2096,8 @@ def show_login(cookie_manager):
 
             if st.button("Clear All Login Data", use_container_width=True):
                 try:
-                    from datetime import timedelta
-
-                    # Clear all authentication cookies
-                    cookie_manager.delete('church_att_session')
-
-                    # Set both to empty with past expiry
-                    past_date = datetime.now() - timedelta(days=1)
-                    cookie_manager.set(cookie='church_att_session', val='', expires_at=past_date)
-
-                    # Set logout marker to prevent auto-login
-                    future_date = datetime.now() + timedelta(minutes=10)
-                    cookie_manager.set(cookie='church_att_logged_out', val='true', expires_at=future_date)
+                    # Replace the session with a logout marker to prevent auto-login
+                    clear_auth_cookies(cookie_manager, marker_minutes=10)
 
                     # Mark in session that we're clearing data
                     st.session_state.clear_login_data = True
@@ -1507,6 +2135,15 @@ def show_login(cookie_manager):
 
 
 # Cookie-based authentication functions
+LOGGED_OUT_COOKIE_PREFIX = 'logged_out|'
+
+
+def make_auth_token(username: str, password_hash: str) -> str:
+    """Derive the remember-me token; it changes whenever the password does"""
+    # Keyed BLAKE2b: the password hash is the key (capped at BLAKE2b's 64-byte limit)
+    return hashlib.blake2b(username.encode(), key=password_hash.encode()[:64], digest_size=32).hexdigest()
+
+
 def save_auth_cookie(cookie_manager, username: str, auth_token: str, remember_days: int = 30):
     """Save authentication token to cookies"""
     try:
@@ -1534,6 +2171,10 @@ def check_auth_cookie(cookie_manager, user_manager):
         # Get the combined session cookie
         session_cookie = cookie_manager.get('church_att_session')
 
+        # A logged-out marker never auto-logs in
+        if session_cookie and session_cookie.startswith(LOGGED_OUT_COOKIE_PREFIX):
+            return False
+
         if session_cookie and '||||||' in session_cookie:
             # Split the combined value
             parts = session_cookie.split('||||||')
@@ -1546,32 +2187,27 @@ def check_auth_cookie(cookie_manager, user_manager):
 
         if username and auth_token:
             # Load users and verify the user still exists and is active
-            users_df = user_manager.load_users()
-
-            if not users_df.empty:
-                user_row = users_df[users_df['username'] == username]
-
-                if not user_row.empty:
-                    user_data = user_row.iloc[0].to_dict()
-
-                    # Verify user is active and token matches
-                    expected_token = hashlib.sha256(f"{username}:{user_data['password_hash']}".encode()).hexdigest()
-
-                    if user_data.get('is_active', False) and auth_token == expected_token:
-                        # Auto-login
-                        st.session_state.authenticated = True
-                        st.session_state.user = {
-                            'username': user_data['username'],
-                            'role': user_data['role'],
-                            'full_name': user_data['full_name'],
-                            'email': user_data['email'],
-                            'must_change_password': user_data.get('must_change_password', False)
-                        }
-                        st.session_state.login_time = datetime.now()
+            user_data = user_manager.get_cached_user(username)
+
+            if user_data is not None:
+                # Verify user is active and token matches (constant-time comparison)
+                expected_token = make_auth_token(username, user_data['password_hash'])
+
+                if user_data.get('is_active', False) and hmac.compare_digest(auth_token, expected_token):
+                    # Auto-login
+                    st.session_state.authenticated = True
+                    st.session_state.user = {
+                        'username': user_data['username'],
+                        'role': user_data['role'],
+                        'full_name': user_data['full_name'],
+                        'email': user_data['email'],
+                        'must_change_password': user_data.get('must_change_password', False)
+                    }
+                    st.session_state.login_time = datetime.now()
 
-                        # Update last login
-                        user_manager.update_last_login(username)
-                        return True
+                    # Update last login
+                    user_manager.update_last_login(username, row=user_data['row_number'], last_login=user_data['last_login'])
+                    return True
 
         return False
     except Exception as e:
@@ -1579,28 +2215,15 @@ def check_auth_cookie(cookie_manager, user_manager):
         return False
 
 
-def clear_auth_cookies(cookie_manager):
+def clear_auth_cookies(cookie_manager, marker_minutes: int = 5):
     """Clear authentication cookies on logout"""
     try:
-        from datetime import timedelta
-
-        # Delete the authentication cookie
-        cookie_manager.delete('church_att_session')
-
-        # Set it to an empty value with past expiry to ensure browser removes it
-        past_date = datetime.now() - timedelta(days=1)
+        # Overwrite the session cookie with a logged-out marker in a single write.
+        # check_auth_cookie rejects it, which prevents auto-login even after page refresh
+        logout_expiry = datetime.now() + timedelta(minutes=marker_minutes)
         cookie_manager.set(
             cookie='church_att_session',
-            val='',
-            expires_at=past_date
-        )
-
-        # Set a "logged_out" marker cookie that persists across page reloads
-        # This prevents auto-login even after page refresh
-        logout_expiry = datetime.now() + timedelta(minutes=5)  # Lasts 5 minutes
-        cookie_manager.set(
-            cookie='church_att_logged_out',
-            val='true',
+            val=f"{LOGGED_OUT_COOKIE_PREFIX}{datetime.now().isoformat()}",
             expires_at=logout_expiry
         )
     except Exception as e:
@@ -1623,10 +2246,10 @@ def main():
     # Initialize managers for authentication check
     if not st.session_state.authenticated:
         if 'sheets_manager' not in st.session_state:
-            st.session_state.sheets_manager = GoogleSheetsManager()
+            st.session_state.sheets_manager = get_sheets_manager()
 
         if 'user_manager' not in st.session_state:
-            st.session_state.user_manager = UserManager(st.session_state.sheets_manager)
+            st.session_state.user_manager = get_user_manager()
 
         # TEMPORARILY DISABLED: Auto-login from cookies
         # Having issues with cookie persistence causing login conflicts
@@ -1643,16 +2266,24 @@ def main():
     
     # Initialize managers
     if 'sheets_manager' not in st.session_state:
-        st.session_state.sheets_manager = GoogleSheetsManager()
+        st.session_state.sheets_manager = get_sheets_manager()
     
     if 'user_manager' not in st.session_state:
-        st.session_state.user_manager = UserManager(st.session_state.sheets_manager)
+        st.session_state.user_manager = get_user_manager()
     
     # Check for password change requirement
     if st.session_state.user.get('must_change_password', False):
         show_password_change()
         return
     
+    if st.session_state.pop('password_changed', False):
+        st.toast("Password changed successfully! You can now access the system.", icon="✅")
+    
+    # Fetch Members and Attendance in one request for the first page after login, unless already cached
+    if not st.session_state.get('sheets_prefetched', False):
+        st.session_state.sheets_manager.prefetch(['Members', 'Attendance'])
+        st.session_state.sheets_prefetched = True
+    
     # Sidebar with church branding
     st.sidebar.markdown("""
         <div style='text-align: center; padding: 1.5rem 1rem; margin-bottom: 1.5rem; border-bottom: 2px solid rgba(175, 150, 89, 0.3);'>
@@ -1708,6 +2339,10 @@ def main():
         if st.session_state.sheets_manager.connection_timestamp:
             duration = time.time() - st.session_state.sheets_manager.connection_timestamp
             st.sidebar.caption(f"Connected for {duration/60:.1f} minutes")
+        # Cache effectiveness for admins
+        if st.session_state.user_manager.has_permission(st.session_state.user['role'], 'admin_panel'):
+            stats = st.session_state.sheets_manager.cache_stats()
+            st.sidebar.caption(f"Cache: {stats['hits']} hits / {stats['misses']} misses")
     else:
         st.sidebar.error("Not connected to Google Sheets")
         if st.sidebar.button("🔄 Try to Connect"):
@@ -1852,16 +2487,14 @@ def show_password_change():
                 return
             
             # Verify current password
-            users_df = st.session_state.user_manager.load_users()
-            user_row = users_df[users_df['username'] == user['username']]
+            user_data = st.session_state.user_manager.get_cached_user(user['username'])
             
-            if user_row.empty:
+            if user_data is None:
                 st.error("User not found")
                 return
             
-            user_data = user_row.iloc[0].to_dict()
-            
-            if not st.session_state.user_manager.verify_password(current_password, user_data['password_hash'], user_data['salt']):
+            if not st.session_state.user_manager.verify_password(current_password, user_data['password_hash'], user_data['salt'],
+                                                                 user_data.get('kdf_version', UserManager.LEGACY_KDF_VERSION)):
                 st.error("Current password is incorrect")
                 return
             
@@ -1869,32 +2502,34 @@ def show_password_change():
             new_hash, new_salt = st.session_state.user_manager.hash_password(new_password)
             
             try:
-                worksheet = st.session_state.sheets_manager.spreadsheet.worksheet("Users")
-                users_data = worksheet.get_all_records()
+                worksheet = st.session_state.sheets_manager.ws("Users")
+                st.session_state.user_manager._ensure_kdf_column(worksheet)
+                # Sheet row from the cached users index, confirmed before writing
+                # in case another session has shifted the Users sheet since
+                i = user_data['row_number']
+                if worksheet.cell(i, 1).value != user['username']:
+                    st.session_state.user_manager._clear_users_cache()
+                    st.error("User list changed since it was loaded, please try again")
+                    return
                 
-                for i, user_record in enumerate(users_data, start=2):
-                    if user_record['username'] == user['username']:
-                        # Update password hash, salt, and remove password change requirement
-                        worksheet.update_cell(i, 2, new_hash)  # password_hash column
-                        worksheet.update_cell(i, 3, new_salt)  # salt column
-                        worksheet.update_cell(i, 10, False)    # must_change_password column
-                        break
+                # Update password hash, salt, kdf version and remove password change requirement in one request
+                worksheet.batch_update([
+                    {'range': f'B{i}:C{i}', 'values': [[new_hash, new_salt]]},  # password_hash, salt columns
+                    {'range': f'J{i}:K{i}', 'values': [[False, UserManager.KDF_VERSION]]}  # must_change_password, kdf_version columns
+                ], value_input_option='USER_ENTERED')
                 
                 # Update session user data
-                st.session_state.user['must_change_password'] = False
-                st.session_state.user['password_hash'] = new_hash
-                st.session_state.user['salt'] = new_salt
+                st.session_state.user.update({'must_change_password': False, 'password_hash': new_hash, 'salt': new_salt})
                 
                 # Clear user cache to force refresh
-                if hasattr(st.session_state.user_manager, '_clear_cache'):
-                    st.session_state.user_manager._clear_cache("load_users")
+                st.session_state.user_manager._clear_users_cache()
                 
                 # Reset admin check to prevent recreation
-                if 'admin_check_done' in st.session_state:
-                    del st.session_state.admin_check_done
+                if 'bootstrapped' in st.session_state:
+                    del st.session_state.bootstrapped
                 
-                st.success("Password changed successfully! You can now access the system.")
-                time.sleep(2)
+                # Confirm on the next run with a toast instead of holding this thread for 2 seconds
+                st.session_state.password_changed = True
                 st.rerun()
                 
             except Exception as e:
@@ -1931,9 +2566,7 @@ def show_user_management():
             display_df['last_login'] = display_df['last_login'].fillna('Never')
             
             # Add role names
-            display_df['role_name'] = display_df['role'].apply(
-                lambda x: user_manager.get_user_role_info(x).get('name', x)
-            )
+            display_df['role_name'] = display_df['role'].map(UserManager.ROLE_NAMES).fillna(display_df['role'])
             
             st.dataframe(
                 display_df[['username', 'full_name', 'role_name', 'email', 'created_date', 'last_login', 'is_active']],
@@ -1963,7 +2596,7 @@ def show_user_management():
             with col3:
                 role_counts = users_df['role'].value_counts()
                 most_common_role = role_counts.index[0] if not role_counts.empty else "None"
-                role_name = user_manager.get_user_role_info(most_common_role).get('name', most_common_role)
+                role_name = UserManager.ROLE_NAMES.get(most_common_role, most_common_role)
                 st.metric("Most Common Role", role_name)
             with col4:
                 recent_logins = len(users_df[users_df['last_login'] != ''])
@@ -2067,7 +2700,8 @@ def show_user_management():
                         'created_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                         'last_login': '',
                         'is_active': True,
-                        'must_change_password': require_password_change
+                        'must_change_password': require_password_change,
+                        'kdf_version': UserManager.KDF_VERSION
                     }
 
                     if user_manager.save_user(new_user):
@@ -2101,11 +2735,17 @@ def show_user_management():
             if manageable_users.empty:
                 st.info("No other users to manage.")
             else:
+                # Label every option once instead of filtering the frame per option
+                user_labels = {
+                    row.username: f"{row.username} ({row.full_name}) - {UserManager.ROLE_NAMES.get(row.role, 'Unknown')}"
+                    for row in manageable_users[['username', 'full_name', 'role']].itertuples(index=False)
+                }
+                
                 # Select user to manage
                 selected_user = st.selectbox(
                     "Select User to Manage",
-                    options=manageable_users['username'].tolist(),
-                    format_func=lambda x: f"{x} ({manageable_users[manageable_users['username']==x]['full_name'].iloc[0]}) - {user_manager.get_user_role_info(manageable_users[manageable_users['username']==x]['role'].iloc[0]).get('name', 'Unknown')}"
+                    options=list(user_labels),
+                    format_func=user_labels.__getitem__
                 )
                 
                 if selected_user:
@@ -2123,7 +2763,7 @@ def show_user_management():
                         st.write(f"• **Username:** {selected_user}")
                         st.write(f"• **Full Name:** {user_data['full_name']}")
                         st.write(f"• **Email:** {user_data.get('email', 'Not set')}")
-                        st.write(f"• **Role:** {user_manager.get_user_role_info(current_role).get('name', current_role)}")
+                        st.write(f"• **Role:** {UserManager.ROLE_NAMES.get(current_role, current_role)}")
                         st.write(f"• **Status:** {'🟢 Active' if is_active else '🔴 Inactive'}")
                         st.write(f"• **Created:** {user_data.get('created_date', 'Unknown')}")
                         st.write(f"• **Last Login:** {user_data.get('last_login', 'Never')}")
@@ -2215,7 +2855,7 @@ def show_user_management():
             
             # Role distribution
             role_dist = users_df['role'].value_counts()
-            role_dist.index = [user_manager.get_user_role_info(role).get('name', role) for role in role_dist.index]
+            role_dist.index = [UserManager.ROLE_NAMES.get(role, role) for role in role_dist.index]
             
             st.subheader("Role Distribution")
             fig = px.pie(values=role_dist.values, names=role_dist.index, title="Users by Role")
@@ -2223,6 +2863,80 @@ def show_user_management():
             st.plotly_chart(fig, use_container_width=True)
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _dashboard_metrics(attendance_df: pd.DataFrame, members_df: pd.DataFrame, today: date) -> dict:
+    """
+    Compute the dashboard's metrics and chart data.
+
+    Cached on the frames' contents and today's date, so widget reruns reuse
+    the aggregates until the sheets change.
+    """
+    metrics = {
+        'total_members': len(members_df) if not members_df.empty else 0,
+        'today_attendance': 0,
+        'weekly_attendance': 0,
+        'monthly_attendance': 0,
+        'avg_weekly_attendance': 0,
+        'total_groups': 0,
+        'unique_attendees': 0,
+        'daily_counts': pd.Series(dtype='int64'),
+        'group_stats': None,
+        'day_counts': pd.Series(dtype='int64'),
+        'member_attendance': pd.Series(dtype='int64'),
+        'recent_records': pd.DataFrame()
+    }
+    
+    if not attendance_df.empty:
+        # Sort by date once; each window is then a binary search instead of a column scan
+        by_date = attendance_df[attendance_df['Date'].notna()].sort_values('Date', kind='stable')
+        window_starts = pd.to_datetime([today, today + timedelta(days=1), today - timedelta(days=7),
+                                        today - timedelta(days=30), today - timedelta(days=56)])
+        i_today, i_tomorrow, i_week, i_month, i_8_weeks = by_date['Date'].searchsorted(window_starts)
+        
+        metrics['today_attendance'] = int(i_tomorrow - i_today)
+        metrics['weekly_attendance'] = len(by_date) - int(i_week)
+        
+        recent_attendance = by_date.iloc[i_month:]
+        metrics['monthly_attendance'] = len(recent_attendance)
+        
+        # Calculate average weekly attendance over last 8 weeks
+        metrics['avg_weekly_attendance'] = (len(by_date) - int(i_8_weeks)) / 8
+        
+        metrics['unique_attendees'] = attendance_df['Full Name'].nunique()
+        
+        # Daily attendance trend
+        if not recent_attendance.empty:
+            # The slice is already in date order, so the groupby need not sort again
+            metrics['daily_counts'] = recent_attendance.groupby('Date', sort=False).size()
+        
+        if not members_df.empty and 'Group' in members_df.columns:
+            # Group attendance rate over every group seen in either sheet, without a merge
+            group_attendance = attendance_df.groupby('Group', sort=False).size()
+            group_members = members_df.groupby('Group', sort=False).size()
+            groups = group_members.index.union(group_attendance.index)
+            total_attendance = group_attendance.reindex(groups, fill_value=0)
+            total_members = group_members.reindex(groups, fill_value=0)
+            metrics['group_stats'] = (total_attendance / total_members * 100).round(1)
+        
+        # Day of week analysis
+        metrics['day_counts'] = _weekday_counts(by_date['Date'])
+        
+        # Top attendees
+        metrics['member_attendance'] = attendance_df.groupby('Full Name', sort=False).size().nlargest(10)
+        
+        # Recent activity: order only the Timestamp column, then take the 10 newest rows
+        latest = attendance_df['Timestamp'].sort_values(ascending=False).index[:10]
+        recent_records = attendance_df.loc[latest, ['Date', 'Full Name', 'Group', 'Timestamp']]
+        recent_records['Date'] = recent_records['Date'].dt.strftime('%Y-%m-%d')
+        recent_records['Time'] = pd.to_datetime(recent_records['Timestamp']).dt.strftime('%H:%M')
+        metrics['recent_records'] = recent_records[['Date', 'Time', 'Full Name', 'Group']]
+    
+    if not members_df.empty and 'Group' in members_df.columns:
+        metrics['total_groups'] = members_df['Group'].nunique()
+    
+    return metrics
+
+
 def show_dashboard():
     """Display the main dashboard with comprehensive metrics and visualizations"""
     st.markdown("""
@@ -2240,32 +2954,15 @@ def show_dashboard():
         st.info("Start by adding members and marking attendance to see dashboard insights!")
         return
     
-    # Calculate key metrics
-    total_members = len(members_df) if not members_df.empty else 0
-    today_attendance = 0
-    weekly_attendance = 0
-    monthly_attendance = 0
-    avg_weekly_attendance = 0
-    total_groups = 0
-    
-    if not attendance_df.empty:
-        today = date.today()
-        today_attendance = len(attendance_df[attendance_df['Date'].dt.date == today])
-        
-        last_week = today - timedelta(days=7)
-        weekly_attendance = len(attendance_df[attendance_df['Date'].dt.date >= last_week])
-        
-        last_month = today - timedelta(days=30)
-        monthly_attendance = len(attendance_df[attendance_df['Date'].dt.date >= last_month])
-        
-        # Calculate average weekly attendance over last 8 weeks
-        last_8_weeks = today - timedelta(days=56)
-        recent_attendance = attendance_df[attendance_df['Date'].dt.date >= last_8_weeks]
-        if not recent_attendance.empty:
-            avg_weekly_attendance = len(recent_attendance) / 8
-    
-    if not members_df.empty and 'Group' in members_df.columns:
-        total_groups = members_df['Group'].nunique()
+    # Calculate key metrics (cached across reruns)
+    metrics = _dashboard_metrics(attendance_df, members_df, date.today())
+    total_members = metrics['total_members']
+    today_attendance = metrics['today_attendance']
+    weekly_attendance = metrics['weekly_attendance']
+    monthly_attendance = metrics['monthly_attendance']
+    avg_weekly_attendance = metrics['avg_weekly_attendance']
+    total_groups = metrics['total_groups']
+    unique_attendees = metrics['unique_attendees']
 
     # Custom CSS for metrics cards
     st.markdown("""
@@ -2312,20 +3009,20 @@ def show_dashboard():
         st.metric("Monthly Attendance", monthly_attendance)
     
     with col3:
-        if not attendance_df.empty:
-            unique_attendees = attendance_df['Full Name'].nunique()
-            st.metric("Active Members", unique_attendees)
-        else:
-            st.metric("Active Members", 0)
+        st.metric("Active Members", unique_attendees)
     
     with col4:
-        engagement_rate = (unique_attendees / total_members * 100) if total_members > 0 and not attendance_df.empty else 0
+        engagement_rate = (unique_attendees / total_members * 100) if total_members > 0 else 0
         st.metric("Engagement Rate", f"{engagement_rate:.1f}%")
     
     # Charts section
+    show_charts = False
     if not attendance_df.empty:
         st.divider()
-        
+        # Expanders still run their body, so a toggle is what skips building and sending the figures
+        show_charts = st.toggle("Show charts", value=True, key="dashboard_show_charts")
+    
+    if show_charts:
         # Attendance trends
         col1, col2 = st.columns(2)
         
@@ -2333,15 +3030,12 @@ def show_dashboard():
             st.subheader("Attendance Trends (Last 30 Days)")
             
             # Daily attendance trend
-            last_30_days = date.today() - timedelta(days=30)
-            recent_attendance = attendance_df[attendance_df['Date'].dt.date >= last_30_days].copy()
+            daily_counts = metrics['daily_counts']
             
-            if not recent_attendance.empty:
-                daily_counts = recent_attendance.groupby('Date').size().reset_index(name='Count')
-                daily_counts['Date'] = pd.to_datetime(daily_counts['Date'])
-                
-                fig = px.line(daily_counts, x='Date', y='Count',
+            if not daily_counts.empty:
+                fig = px.line(x=daily_counts.index, y=daily_counts.values,
                             title="Daily Attendance",
+                            labels={'x': 'Date', 'y': 'Count'},
                             markers=True)
                 fig.update_traces(line_color='#d43c18', marker=dict(color='#060245', size=8))
                 fig.update_layout(
@@ -2359,16 +3053,12 @@ def show_dashboard():
         with col2:
             st.subheader("Group Performance")
             
-            if not members_df.empty and 'Group' in members_df.columns:
-                # Group attendance comparison
-                group_attendance = attendance_df.groupby('Group').size().reset_index(name='Total Attendance')
-                group_members = members_df.groupby('Group').size().reset_index(name='Total Members')
-                group_stats = pd.merge(group_attendance, group_members, on='Group', how='outer').fillna(0)
-                group_stats['Attendance Rate'] = (group_stats['Total Attendance'] / group_stats['Total Members'] * 100).round(1)
-                
-                fig = px.bar(group_stats, x='Group', y='Attendance Rate',
+            group_stats = metrics['group_stats']
+            if group_stats is not None:
+                fig = px.bar(x=group_stats.index, y=group_stats.values,
                            title="Group Attendance Rates (%)",
-                           color='Attendance Rate',
+                           labels={'x': 'Group', 'y': 'Attendance Rate', 'color': 'Attendance Rate'},
+                           color=group_stats.values,
                            color_continuous_scale=[[0, '#060245'], [0.5, '#af9659'], [1, '#d43c18']])
                 fig.update_layout(
                     height=300,
@@ -2386,18 +3076,12 @@ def show_dashboard():
         
         with col1:
             # Day of week analysis
-            if not attendance_df.empty:
-                attendance_df['Day of Week'] = attendance_df['Date'].dt.day_name()
-                day_counts = attendance_df.groupby('Day of Week').size().reset_index(name='Count')
-                
-                # Order days properly
-                day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                day_counts['Day of Week'] = pd.Categorical(day_counts['Day of Week'], categories=day_order, ordered=True)
-                day_counts = day_counts.sort_values('Day of Week')
-                
-                fig = px.bar(day_counts, x='Day of Week', y='Count',
+            day_counts = metrics['day_counts']
+            if not day_counts.empty:
+                fig = px.bar(x=day_counts.index, y=day_counts.values,
                            title="Attendance by Day of Week",
-                           color='Count',
+                           labels={'x': 'Day of Week', 'y': 'Count', 'color': 'Count'},
+                           color=day_counts.values,
                            color_continuous_scale=[[0, '#060245'], [0.5, '#af9659'], [1, '#d43c18']])
                 fig.update_layout(
                     height=300,
@@ -2410,14 +3094,14 @@ def show_dashboard():
         with col2:
             # Top attendees
             st.subheader("Most Active Members")
-            member_attendance = attendance_df.groupby('Full Name').size().reset_index(name='Attendance Count')
-            member_attendance = member_attendance.sort_values('Attendance Count', ascending=False).head(10)
+            member_attendance = metrics['member_attendance']
             
             if not member_attendance.empty:
-                fig = px.bar(member_attendance, x='Attendance Count', y='Full Name',
+                fig = px.bar(x=member_attendance.values, y=member_attendance.index,
                            title="Top 10 Most Active Members",
                            orientation='h',
-                           color='Attendance Count',
+                           labels={'x': 'Attendance Count', 'y': 'Full Name', 'color': 'Attendance Count'},
+                           color=member_attendance.values,
                            color_continuous_scale=[[0, '#060245'], [0.5, '#af9659'], [1, '#d43c18']])
                 fig.update_layout(
                     height=300,
@@ -2458,11 +3142,7 @@ def show_dashboard():
         st.divider()
         st.subheader("Recent Activity")
         
-        recent_records = attendance_df.sort_values('Timestamp', ascending=False).head(10)
-        recent_records['Date'] = recent_records['Date'].dt.strftime('%Y-%m-%d')
-        recent_records['Time'] = pd.to_datetime(recent_records['Timestamp']).dt.strftime('%H:%M')
-        
-        display_recent = recent_records[['Date', 'Time', 'Full Name', 'Group']].copy()
+        display_recent = metrics['recent_records']
         st.dataframe(display_recent, use_container_width=True, hide_index=True)
 
 
@@ -2523,8 +3203,8 @@ def show_attendance_marking():
     
     # Apply search filter
     if search_term:
-        # Case-insensitive search in member names
-        search_mask = filtered_members['Full Name'].str.contains(search_term, case=False, na=False)
+        # Case-insensitive literal search in member names; names are Arrow strings, so this runs in pyarrow
+        search_mask = filtered_members['Full Name'].str.contains(search_term, case=False, regex=False, na=False)
         filtered_members = filtered_members[search_mask]
         
         if filtered_members.empty:
@@ -2567,39 +3247,27 @@ def show_attendance_marking():
         
         st.divider()
         
-        # Create checkboxes for each member
-        selected_members = []
-        
+        # One editable grid with a Present column instead of a checkbox widget per member
         # Sort members by name for better UX
-        filtered_members_sorted = filtered_members.sort_values('Full Name')
+        roster = filtered_members.sort_values('Full Name')[['Full Name', 'Membership Number', 'Group']]
+        roster.insert(0, 'Present', select_all)
+        
+        edited_roster = st.data_editor(
+            roster,
+            column_config={
+                'Present': st.column_config.CheckboxColumn("Present", default=False),
+                'Membership Number': st.column_config.TextColumn("ID")
+            },
+            column_order=['Present', 'Full Name', 'Membership Number'] + (['Group'] if selected_group == 'All Groups' else []),
+            disabled=['Full Name', 'Membership Number', 'Group'],
+            hide_index=True,
+            use_container_width=True
+        )
         
-        for idx, member in filtered_members_sorted.iterrows():
-            member_name = member.get('Full Name', f"Member {idx}")
-            member_id = member.get('Membership Number', '')
-            member_group = member.get('Group', '')
-            
-            # Build display name with search highlighting
-            display_name = f"{member_name}"
-            if member_id:
-                display_name += f" (ID: {member_id})"
-            if selected_group == 'All Groups':
-                display_name += f" - {member_group}"
-            
-            # Add search match indicator
-            if search_term and search_term.lower() in member_name.lower():
-                display_name = f"{display_name}"
-            
-            # Use select_all to determine initial state
-            initial_checked = select_all if 'select_all' in st.session_state else False
-            
-            if st.checkbox(display_name, key=f"member_{idx}", value=initial_checked):
-                selected_members.append({
-                    'Membership Number': member_id,
-                    'Full Name': member_name,
-                    'Group': member_group,
-                    'Date': selected_date.strftime('%Y-%m-%d'),
-                    'Status': 'Present'
-                })
+        present_df = edited_roster.loc[edited_roster['Present'], ['Membership Number', 'Full Name', 'Group']].assign(
+            Date=selected_date.strftime('%Y-%m-%d'), Status='Present'
+        )
+        selected_members = present_df.to_dict('records')
         
         st.divider()
         
@@ -2622,9 +3290,8 @@ def show_attendance_marking():
                         
                         # Show summary of marked attendance
                         st.subheader("Attendance Summary")
-                        summary_df = pd.DataFrame(selected_members)
                         st.dataframe(
-                            summary_df[['Full Name', 'Group', 'Date']],
+                            present_df[['Full Name', 'Group', 'Date']],
                             use_container_width=True,
                             hide_index=True
                         )
@@ -2652,7 +3319,7 @@ def show_member_management():
         else:
             # Ensure phone numbers are formatted correctly before display
             if 'Phone' in members_df.columns:
-                members_df['Phone'] = members_df['Phone'].apply(format_phone_number)
+                members_df['Phone'] = _format_phone_series(members_df['Phone'])
 
             st.dataframe(members_df, use_container_width=True)
             
@@ -2727,15 +3394,12 @@ def show_member_management():
                         'Phone': phone.strip() if phone else ''
                     }
                     
-                    # Add to DataFrame
-                    if members_df.empty:
-                        members_df = pd.DataFrame([new_member])
-                    else:
-                        members_df = pd.concat([members_df, pd.DataFrame([new_member])], ignore_index=True)
-                    
-                    # Save to Google Sheets
+                    # Save to Google Sheets; an empty sheet is written whole so it gets its header row
                     with st.spinner("Adding member..."):
-                        success = st.session_state.sheets_manager.save_members(members_df)
+                        if members_df.empty:
+                            success = st.session_state.sheets_manager.save_members(pd.DataFrame([new_member]))
+                        else:
+                            success = st.session_state.sheets_manager.append_member(new_member)
                         
                         if success:
                             st.success(f"Member '{full_name}' added successfully!")
@@ -2751,14 +3415,18 @@ def show_member_management():
         
         if uploaded_file is not None:
             try:
-                import_df = pd.read_csv(uploaded_file)
+                import_df = read_members_csv(uploaded_file)
                 
                 st.subheader("Preview Import Data")
                 st.dataframe(import_df.head())
                 
                 if st.button("📤 Import Members"):
                     with st.spinner("Importing members..."):
-                        success = st.session_state.sheets_manager.save_members(import_df)
+                        # Append to the existing members; an empty sheet is written whole so it gets its header row
+                        if st.session_state.sheets_manager.load_members().empty:
+                            success = st.session_state.sheets_manager.save_members(import_df)
+                        else:
+                            success = st.session_state.sheets_manager.append_members(import_df)
                         
                         if success:
                             st.success(f"Imported {len(import_df)} members successfully!")
@@ -2777,12 +3445,12 @@ def calculate_comparison_metrics(current_df, all_df, current_start, current_end)
     previous_end = current_start - timedelta(days=1)
 
     previous_df = all_df[
-        (all_df['Date'].dt.date >= previous_start) &
-        (all_df['Date'].dt.date <= previous_end)
+        (all_df['Date'] >= pd.Timestamp(previous_start)) &
+        (all_df['Date'] < pd.Timestamp(previous_end) + pd.Timedelta(days=1))
     ].copy()
 
-    current_days = current_df['Date'].dt.date.nunique()
-    previous_days = previous_df['Date'].dt.date.nunique()
+    current_days = current_df['Date'].dt.normalize().nunique()
+    previous_days = previous_df['Date'].dt.normalize().nunique()
 
     current_avg = len(current_df) / current_days if current_days > 0 else 0
     previous_avg = len(previous_df) / previous_days if previous_days > 0 else 0
@@ -2802,48 +3470,40 @@ def calculate_comparison_metrics(current_df, all_df, current_start, current_end)
 
 def detect_at_risk_members(attendance_df, members_df):
     """Detect members who haven't attended recently"""
-    today = date.today()
+    today = pd.Timestamp(date.today())
 
     # Get last attendance date for each member
-    last_attendance = attendance_df.groupby('Full Name')['Date'].max().reset_index()
-
-    # Convert to date and calculate days since last attendance
-    last_attendance['Last_Date'] = pd.to_datetime(last_attendance['Date']).dt.date
-    last_attendance['Days Since Last'] = last_attendance['Last_Date'].apply(lambda x: (today - x).days)
-
-    # Categorize risk levels
-    at_risk = []
-    for _, row in last_attendance.iterrows():
-        days_since = row['Days Since Last']
-        risk_level = None
-
-        if days_since >= 42:  # 6+ weeks
-            risk_level = "Critical"
-        elif days_since >= 21:  # 3+ weeks
-            risk_level = "Warning"
-
-        if risk_level:
-            member_info = members_df[members_df['Full Name'] == row['Full Name']]
-
-            # Get phone number if available - preserve as text format
-            phone = ''
-            if len(member_info) > 0 and 'Phone' in member_info.columns:
-                phone_value = member_info['Phone'].values[0]
-                phone = format_phone_number(phone_value)
-
-            at_risk.append({
-                'Full Name': row['Full Name'],
-                'Phone': phone,
-                'Group': member_info['Group'].values[0] if len(member_info) > 0 else 'Unknown',
-                'Days Since Last': days_since,
-                'Last Seen': row['Last_Date'].strftime('%Y-%m-%d') if hasattr(row['Last_Date'], 'strftime') else str(row['Last_Date']),
-                'Risk Level': risk_level
-            })
+    last_attendance = attendance_df.groupby('Full Name', as_index=False)['Date'].max()
+    last_date = last_attendance['Date'].dt.normalize()
+
+    # Calculate days since last attendance and categorize risk levels
+    days_since = (today - last_date).dt.days
+    last_attendance['Risk Level'] = np.select([days_since >= 42, days_since >= 21],  # 6+ weeks, 3+ weeks
+                                              ['Critical', 'Warning'], default='')
+    at_risk_mask = last_attendance['Risk Level'] != ''
+
+    at_risk = pd.DataFrame({
+        'Full Name': last_attendance.loc[at_risk_mask, 'Full Name'],
+        'Days Since Last': days_since[at_risk_mask].astype(int),
+        'Last Seen': last_date[at_risk_mask].dt.strftime('%Y-%m-%d'),
+        'Risk Level': last_attendance.loc[at_risk_mask, 'Risk Level']
+    })
+
+    # Look up group and phone from each member's first row - preserve phone as text format
+    member_info = members_df.drop_duplicates('Full Name').set_index('Full Name') if 'Full Name' in members_df.columns else pd.DataFrame()
+    if 'Phone' in member_info.columns:
+        at_risk['Phone'] = _format_phone_series(at_risk['Full Name'].map(member_info['Phone']))
+    else:
+        at_risk['Phone'] = ''
+    if 'Group' in member_info.columns:
+        at_risk['Group'] = at_risk['Full Name'].map(member_info['Group']).fillna('Unknown')
+    else:
+        at_risk['Group'] = 'Unknown'
 
-    return pd.DataFrame(at_risk)
+    return at_risk[['Full Name', 'Phone', 'Group', 'Days Since Last', 'Last Seen', 'Risk Level']].reset_index(drop=True)
 
 
-def generate_actionable_insights(attendance_df, members_df, comparison_metrics, at_risk_df):
+def generate_actionable_insights(attendance_df, members_df, comparison_metrics, critical, warning):
     """Generate auto-insights based on data"""
     insights = []
 
@@ -2857,9 +3517,7 @@ def generate_actionable_insights(attendance_df, members_df, comparison_metrics,
         insights.append("➡️ Attendance is stable (within 5% of previous period)")
 
     # At-risk members insight
-    if len(at_risk_df) > 0:
-        critical = len(at_risk_df[at_risk_df['Risk Level'] == 'Critical'])
-        warning = len(at_risk_df[at_risk_df['Risk Level'] == 'Warning'])
+    if critical or warning:
         if critical > 0:
             insights.append(f"🚨 {critical} members haven't been seen in 6+ weeks (CRITICAL)")
         if warning > 0:
@@ -2874,25 +3532,23 @@ def generate_actionable_insights(attendance_df, members_df, comparison_metrics,
 
     # Top group insight
     if not members_df.empty and 'Group' in members_df.columns:
-        group_participation = {}
-        for group in members_df['Group'].unique():
-            group_members = len(members_df[members_df['Group'] == group])
-            group_attendance = attendance_df[attendance_df['Group'] == group]['Full Name'].nunique()
-            if group_members > 0:
-                group_participation[group] = (group_attendance / group_members) * 100
-
-        if group_participation:
-            top_group = max(group_participation, key=group_participation.get)
+        # Share of each group's members who attended, in members' group order so ties keep the first group
+        total_by_group = members_df.groupby('Group', sort=False).size()
+        active_by_group = attendance_df.groupby('Group', sort=False)['Full Name'].nunique()
+        group_participation = active_by_group.reindex(total_by_group.index, fill_value=0) / total_by_group * 100
+
+        if not group_participation.empty:
+            top_group = group_participation.idxmax()
             top_pct = group_participation[top_group]
             insights.append(f"Top performing group: {top_group} ({top_pct:.0f}% participation)")
 
-    # Peak attendance time
-    if 'Timestamp' in attendance_df.columns:
-        attendance_df['Hour'] = pd.to_datetime(attendance_df['Timestamp']).dt.hour
-        peak_hour = attendance_df['Hour'].mode()[0] if len(attendance_df['Hour'].mode()) > 0 else None
-        if peak_hour:
+    # Peak attendance time (Hour is parsed once by show_analytics)
+    if 'Hour' in attendance_df.columns:
+        hour_mode = attendance_df['Hour'].mode()
+        peak_hour = int(hour_mode.iloc[0]) if len(hour_mode) > 0 else None
+        if peak_hour is not None:
             period = "AM" if peak_hour < 12 else "PM"
-            display_hour = peak_hour if peak_hour <= 12 else peak_hour - 12
+            display_hour = peak_hour % 12 or 12
             insights.append(f"⏰ Peak attendance: {display_hour}:00 {period}")
 
     return insights
@@ -3025,8 +3681,8 @@ def show_analytics():
     # Filter data by selected period
     if days < 9999 and days > 0:
         filtered_attendance = attendance_df[
-            (attendance_df['Date'].dt.date >= start_date) & 
-            (attendance_df['Date'].dt.date <= end_date)
+            (attendance_df['Date'] >= pd.Timestamp(start_date)) & 
+            (attendance_df['Date'] < pd.Timestamp(end_date) + pd.Timedelta(days=1))
         ].copy()
     else:
         filtered_attendance = attendance_df.copy()
@@ -3035,14 +3691,21 @@ def show_analytics():
         st.warning("No attendance data found for the selected period.")
         return
 
+    # Parse check-in hours once for the insights panel and the time-of-day chart
+    if 'Timestamp' in filtered_attendance.columns:
+        filtered_attendance['Hour'] = pd.to_datetime(filtered_attendance['Timestamp'], errors='coerce').dt.hour
+
     # Calculate comparison metrics
     comparison_metrics = calculate_comparison_metrics(filtered_attendance, attendance_df, start_date, end_date)
 
     # Detect at-risk members
     at_risk_df = detect_at_risk_members(attendance_df, members_df)
+    risk_counts = at_risk_df['Risk Level'].value_counts()
+    critical_count = int(risk_counts.get('Critical', 0))
+    warning_count = int(risk_counts.get('Warning', 0))
 
     # Generate actionable insights
-    insights = generate_actionable_insights(filtered_attendance, members_df, comparison_metrics, at_risk_df)
+    insights = generate_actionable_insights(filtered_attendance, members_df, comparison_metrics, critical_count, warning_count)
 
     # === PHASE 1 ENHANCEMENT 1: Actionable Insights Panel ===
     st.markdown("---")
@@ -3064,22 +3727,18 @@ def show_analytics():
         col1, col2 = st.columns([2, 1])
 
         with col1:
-            # Color code by risk level
-            def highlight_risk(row):
-                if row['Risk Level'] == 'Critical':
-                    return ['background-color: #ffcdd2'] * len(row)
-                elif row['Risk Level'] == 'Warning':
-                    return ['background-color: #fff9c4'] * len(row)
-                return [''] * len(row)
-
-            styled_df = at_risk_df.style.apply(highlight_risk, axis=1)
+            # Color code by risk level; styles the whole frame at once instead of row by row
+            def highlight_risk(df):
+                css = pd.DataFrame('', index=df.index, columns=df.columns)
+                css.loc[df['Risk Level'] == 'Critical', :] = 'background-color: #ffcdd2'
+                css.loc[df['Risk Level'] == 'Warning', :] = 'background-color: #fff9c4'
+                return css
+
+            styled_df = at_risk_df.style.apply(highlight_risk, axis=None)
             st.dataframe(styled_df, use_container_width=True, hide_index=True)
 
         with col2:
             # Summary stats
-            critical_count = len(at_risk_df[at_risk_df['Risk Level'] == 'Critical'])
-            warning_count = len(at_risk_df[at_risk_df['Risk Level'] == 'Warning'])
-
             st.metric("🚨 Critical (6+ weeks)", critical_count)
             st.metric("Warning (3+ weeks)", warning_count)
 
@@ -3103,7 +3762,7 @@ def show_analytics():
 
     total_attendance_records = len(filtered_attendance)
     unique_attendees = filtered_attendance['Full Name'].nunique()
-    unique_days = filtered_attendance['Date'].dt.date.nunique()
+    unique_days = filtered_attendance['Date'].dt.normalize().nunique()
     avg_daily_attendance = total_attendance_records / unique_days if unique_days > 0 else 0
 
     # Calculate deltas
@@ -3126,15 +3785,15 @@ def show_analytics():
     # Attendance trends over time
     st.subheader("Attendance Trends")
     
-    # Group by time periods for trend analysis
+    # Group by time periods for trend analysis: one daily rollup, re-binned to weeks and months
+    daily_totals = _daily_counts(filtered_attendance['Date'])
     col1, col2 = st.columns(2)
     
     with col1:
         # Weekly trends
         st.subheader("Weekly Trends")
-        filtered_attendance['Week'] = filtered_attendance['Date'].dt.to_period('W')
-        weekly_counts = filtered_attendance.groupby('Week').size().reset_index(name='Count')
-        weekly_counts['Week'] = weekly_counts['Week'].dt.start_time
+        weekly_counts = daily_totals.resample('W-MON', label='left', closed='left').sum()
+        weekly_counts = weekly_counts[weekly_counts > 0].rename_axis('Week').reset_index(name='Count')
         
         if len(weekly_counts) > 1:
             fig = px.line(weekly_counts, x='Week', y='Count',
@@ -3152,9 +3811,8 @@ def show_analytics():
     with col2:
         # Monthly trends (if data spans multiple months)
         st.subheader("Monthly Trends")
-        filtered_attendance['Month'] = filtered_attendance['Date'].dt.to_period('M')
-        monthly_counts = filtered_attendance.groupby('Month').size().reset_index(name='Count')
-        monthly_counts['Month'] = monthly_counts['Month'].dt.start_time
+        monthly_counts = daily_totals.resample('MS').sum()
+        monthly_counts = monthly_counts[monthly_counts > 0].rename_axis('Month').reset_index(name='Count')
         
         if len(monthly_counts) > 1:
             fig = px.bar(monthly_counts, x='Month', y='Count',
@@ -3174,17 +3832,15 @@ def show_analytics():
     st.markdown("---")
     st.subheader("Attendance Heatmap Calendar")
 
-    # Create daily attendance counts
-    daily_counts = filtered_attendance.groupby(filtered_attendance['Date'].dt.date).size().reset_index(name='Count')
-    daily_counts.columns = ['Date', 'Count']
+    # Daily attendance counts, reusing the daily rollup from the trend charts
+    daily_counts = daily_totals.reset_index(name='Count')
 
     if len(daily_counts) > 0:
         # Create heatmap data
-        daily_counts['Date'] = pd.to_datetime(daily_counts['Date'])
-        daily_counts['Week'] = daily_counts['Date'].dt.isocalendar().week
-        daily_counts['Year'] = daily_counts['Date'].dt.year
-        daily_counts['DayOfWeek'] = daily_counts['Date'].dt.dayofweek
-        daily_counts['WeekDay'] = daily_counts['Date'].dt.day_name()
+        daily_counts = daily_counts.assign(
+            Week=daily_counts['Date'].dt.isocalendar().week,
+            WeekDay=daily_counts['Date'].dt.day_name()
+        )
 
         # Create pivot for heatmap
         heatmap_data = daily_counts.pivot_table(
@@ -3196,8 +3852,7 @@ def show_analytics():
         )
 
         # Reorder days
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        heatmap_data = heatmap_data.reindex([day for day in day_order if day in heatmap_data.index])
+        heatmap_data = heatmap_data.reindex([day for day in DAY_NAMES if day in heatmap_data.index])
 
         # Create heatmap
         fig = go.Figure(data=go.Heatmap(
@@ -3253,29 +3908,18 @@ def show_analytics():
         st.subheader("Group Performance Analysis")
         
         if not members_df.empty and 'Group' in members_df.columns:
-            # Group statistics
-            group_stats = []
-            for group in members_df['Group'].unique():
-                group_members = members_df[members_df['Group'] == group]
-                group_attendance = filtered_attendance[filtered_attendance['Group'] == group]
-                
-                total_members = len(group_members)
-                total_attendance = len(group_attendance)
-                unique_attendees = group_attendance['Full Name'].nunique()
-                
-                participation_rate = (unique_attendees / total_members * 100) if total_members > 0 else 0
-                avg_attendance_per_service = total_attendance / unique_days if unique_days > 0 else 0
-                
-                group_stats.append({
-                    'Group': group,
-                    'Total Members': total_members,
-                    'Active Members': unique_attendees,
-                    'Participation Rate (%)': round(participation_rate, 1),
-                    'Total Attendance': total_attendance,
-                    'Avg per Service': round(avg_attendance_per_service, 1)
-                })
+            # Group statistics: one groupby per frame, aligned on the members' groups
+            total_members = members_df.groupby('Group', sort=False).size()
+            group_attendance = filtered_attendance.groupby('Group', sort=False)['Full Name'].agg(['size', 'nunique'])
+            group_attendance = group_attendance.reindex(total_members.index, fill_value=0)
             
-            group_df = pd.DataFrame(group_stats)
+            group_df = pd.DataFrame({
+                'Total Members': total_members,
+                'Active Members': group_attendance['nunique'],
+                'Participation Rate (%)': (group_attendance['nunique'] / total_members * 100).round(1),
+                'Total Attendance': group_attendance['size'],
+                'Avg per Service': (group_attendance['size'] / unique_days).round(1) if unique_days > 0 else 0.0
+            }).rename_axis('Group').reset_index()
             
             col1, col2 = st.columns(2)
             with col1:
@@ -3292,30 +3936,16 @@ def show_analytics():
         st.subheader("Member Engagement Analysis")
         
         # Member attendance frequency
-        member_stats = filtered_attendance.groupby('Full Name').agg({
-            'Date': 'count',
-            'Group': 'first'
-        }).reset_index()
-        member_stats.columns = ['Full Name', 'Attendance Count', 'Group']
+        member_stats = filtered_attendance.groupby('Full Name').agg(
+            **{'Attendance Count': ('Group', 'size'), 'Group': ('Group', 'first')}
+        ).reset_index()
         member_stats = member_stats.sort_values('Attendance Count', ascending=False)
         
-        # Categorize engagement levels
-        def categorize_engagement(count, total_services):
-            if total_services == 0:
-                return "No Data"
-            percentage = (count / total_services) * 100
-            if percentage >= 80:
-                return "Highly Engaged (80%+)"
-            elif percentage >= 50:
-                return "Moderately Engaged (50-79%)"
-            elif percentage >= 25:
-                return "Occasionally Engaged (25-49%)"
-            else:
-                return "Low Engagement (<25%)"
-        
-        member_stats['Engagement Level'] = member_stats['Attendance Count'].apply(
-            lambda x: categorize_engagement(x, unique_days)
-        )
+        # Categorize engagement levels by share of services attended
+        if unique_days > 0:
+            member_stats['Engagement Level'] = _engagement_level_series(member_stats['Attendance Count'] / unique_days * 100)
+        else:
+            member_stats['Engagement Level'] = "No Data"
         
         col1, col2 = st.columns(2)
         
@@ -3359,13 +3989,7 @@ def show_analytics():
         
         with col1:
             # Day of week patterns
-            filtered_attendance['Day of Week'] = filtered_attendance['Date'].dt.day_name()
-            day_counts = filtered_attendance.groupby('Day of Week').size().reset_index(name='Count')
-            
-            # Order days properly
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            day_counts['Day of Week'] = pd.Categorical(day_counts['Day of Week'], categories=day_order, ordered=True)
-            day_counts = day_counts.sort_values('Day of Week')
+            day_counts = _weekday_counts(filtered_attendance['Date']).rename_axis('Day of Week').reset_index(name='Count')
             
             fig = px.bar(day_counts, x='Day of Week', y='Count',
                         title="Attendance by Day of Week",
@@ -3376,8 +4000,7 @@ def show_analytics():
         
         with col2:
             # Time of day patterns (if timestamp data available)
-            if 'Timestamp' in filtered_attendance.columns:
-                filtered_attendance['Hour'] = pd.to_datetime(filtered_attendance['Timestamp']).dt.hour
+            if 'Hour' in filtered_attendance.columns:
                 hour_counts = filtered_attendance.groupby('Hour').size().reset_index(name='Count')
                 
                 fig = px.line(hour_counts, x='Hour', y='Count',
@@ -3395,8 +4018,7 @@ def show_analytics():
         
         if unique_days > 7:  # Need sufficient data for growth analysis
             # Calculate rolling averages
-            daily_attendance = filtered_attendance.groupby('Date').size().reset_index(name='Count')
-            daily_attendance = daily_attendance.sort_values('Date')
+            daily_attendance = daily_totals.reset_index(name='Count')
             
             # 7-day rolling average
             daily_attendance['Rolling_7_Day'] = daily_attendance['Count'].rolling(window=7, center=True).mean()
@@ -3438,10 +4060,8 @@ def show_analytics():
                          delta=f"{growth_rate:+.1f}%" if growth_rate != 0 else None)
                 
                 # New vs returning attendees
-                first_attendance = filtered_attendance.groupby('Full Name')['Date'].min()
-                filtered_attendance['Is_New_Attendee'] = filtered_attendance.apply(
-                    lambda row: first_attendance[row['Full Name']] == row['Date'], axis=1
-                )
+                first_attendance = filtered_attendance.groupby('Full Name')['Date'].transform('min')
+                filtered_attendance['Is_New_Attendee'] = filtered_attendance['Date'].eq(first_attendance)
                 
                 new_attendees_by_week = filtered_attendance[filtered_attendance['Is_New_Attendee']].groupby(
                     filtered_attendance['Date'].dt.to_period('W')
@@ -3576,8 +4196,8 @@ def show_reports():
     # Filter attendance data
     if not attendance_df.empty:
         filtered_attendance = attendance_df[
-            (attendance_df['Date'].dt.date >= start_date) & 
-            (attendance_df['Date'].dt.date <= end_date)
+            (attendance_df['Date'] >= pd.Timestamp(start_date)) & 
+            (attendance_df['Date'] < pd.Timestamp(end_date) + pd.Timedelta(days=1))
         ].copy()
         
         if selected_groups:
@@ -3681,7 +4301,7 @@ def generate_monthly_summary_report(attendance_df, members_df, start_date, end_d
     
     total_attendance = len(attendance_df)
     unique_attendees = attendance_df['Full Name'].nunique()
-    unique_days = attendance_df['Date'].dt.date.nunique()
+    unique_days = attendance_df['Date'].dt.normalize().nunique()
     avg_daily_attendance = total_attendance / unique_days if unique_days > 0 else 0
     
     with col1:
@@ -3695,7 +4315,7 @@ def generate_monthly_summary_report(attendance_df, members_df, start_date, end_d
     
     # Daily attendance chart
     st.subheader("Daily Attendance Breakdown")
-    daily_attendance = attendance_df.groupby('Date').size().reset_index(name='Count')
+    daily_attendance = _daily_counts(attendance_df['Date']).reset_index(name='Count')
     
     fig = px.bar(daily_attendance, x='Date', y='Count',
                 title=f"Daily Attendance - {start_date.strftime('%B %Y')}",
@@ -3707,11 +4327,9 @@ def generate_monthly_summary_report(attendance_df, members_df, start_date, end_d
     # Group breakdown
     if 'Group' in attendance_df.columns:
         st.subheader("Group Performance")
-        group_summary = attendance_df.groupby('Group').agg({
-            'Full Name': 'nunique',
-            'Date': 'count'
-        }).reset_index()
-        group_summary.columns = ['Group', 'Unique Members', 'Total Attendance']
+        group_summary = attendance_df.groupby('Group')['Full Name'].agg(
+            **{'Unique Members': 'nunique', 'Total Attendance': 'size'}
+        ).reset_index()
         
         col1, col2 = st.columns(2)
         with col1:
@@ -3724,8 +4342,7 @@ def generate_monthly_summary_report(attendance_df, members_df, start_date, end_d
     
     # Top attendees
     st.subheader("Top Attendees")
-    top_attendees = attendance_df.groupby(['Full Name', 'Group']).size().reset_index(name='Attendance Count')
-    top_attendees = top_attendees.sort_values('Attendance Count', ascending=False).head(10)
+    top_attendees = attendance_df.groupby(['Full Name', 'Group']).size().nlargest(10).reset_index(name='Attendance Count')
     
     col1, col2 = st.columns(2)
     with col1:
@@ -3742,36 +4359,37 @@ def generate_monthly_summary_report(attendance_df, members_df, start_date, end_d
         )
         st.plotly_chart(fig, use_container_width=True)
     
-    # Export options using universal export section
-    csv_exports = {
-        "Daily Attendance": pd.DataFrame({
-            'Date': daily_attendance['Date'].dt.strftime('%Y-%m-%d'),
-            'Attendance Count': daily_attendance['Count']
-        }).to_csv(index=False)
-    }
-    
-    if 'Group' in attendance_df.columns and not group_summary.empty:
-        csv_exports["Group Summary"] = group_summary.to_csv(index=False)
-    
-    csv_exports["Top Attendees"] = top_attendees.to_csv(index=False)
-
-    # Store data in session state for export
-    st.session_state['report_data'] = {
-        'attendance_df': attendance_df,
-        'members_df': members_df,
-        'start_date': start_date,
-        'end_date': end_date,
-        'report_type': "Monthly Summary Report",
-        'selected_groups': selected_groups,
-        'csv_exports': csv_exports
-    }
-
     # Show export section in expander (not auto-expanded)
     with st.expander("📥 Export Options", expanded=False):
-        create_universal_export_section(
-            attendance_df, members_df, start_date, end_date,
-            "Monthly Summary Report", selected_groups, csv_exports
-        )
+        if export_requested("Monthly Summary Report"):
+            # Export options using universal export section
+            csv_exports = {
+                "Daily Attendance": pd.DataFrame({
+                    'Date': daily_attendance['Date'].dt.strftime('%Y-%m-%d'),
+                    'Attendance Count': daily_attendance['Count']
+                }).to_csv(index=False)
+            }
+            
+            if 'Group' in attendance_df.columns and not group_summary.empty:
+                csv_exports["Group Summary"] = group_summary.to_csv(index=False)
+            
+            csv_exports["Top Attendees"] = top_attendees.to_csv(index=False)
+
+            # Store data in session state for export
+            st.session_state['report_data'] = {
+                'attendance_df': attendance_df,
+                'members_df': members_df,
+                'start_date': start_date,
+                'end_date': end_date,
+                'report_type': "Monthly Summary Report",
+                'selected_groups': selected_groups,
+                'csv_exports': csv_exports
+            }
+
+            create_universal_export_section(
+                attendance_df, members_df, start_date, end_date,
+                "Monthly Summary Report", selected_groups, csv_exports
+            )
 
 
 def generate_group_performance_report(attendance_df, members_df, start_date, end_date, selected_groups):
@@ -3782,32 +4400,27 @@ def generate_group_performance_report(attendance_df, members_df, start_date, end
         st.warning("Insufficient data for group performance report.")
         return
     
-    # Calculate group statistics
-    group_stats = []
-    for group in selected_groups:
-        group_members = members_df[members_df['Group'] == group]
-        group_attendance = attendance_df[attendance_df['Group'] == group]
-        
-        total_members = len(group_members)
-        active_members = group_attendance['Full Name'].nunique()
-        total_attendance = len(group_attendance)
-        unique_days = attendance_df['Date'].dt.date.nunique()
-        
-        participation_rate = (active_members / total_members * 100) if total_members > 0 else 0
-        avg_attendance_per_service = total_attendance / unique_days if unique_days > 0 else 0
-        consistency_score = (total_attendance / (active_members * unique_days) * 100) if active_members > 0 and unique_days > 0 else 0
-        
-        group_stats.append({
-            'Group': group,
-            'Total Members': total_members,
-            'Active Members': active_members,
-            'Participation Rate (%)': round(participation_rate, 1),
-            'Total Attendance': total_attendance,
-            'Avg per Service': round(avg_attendance_per_service, 1),
-            'Consistency Score (%)': round(consistency_score, 1)
-        })
-    
-    group_df = pd.DataFrame(group_stats)
+    # Calculate group statistics: one groupby per frame, in the order the groups were selected
+    groups = pd.Index(selected_groups, name='Group')
+    unique_days = attendance_df['Date'].dt.normalize().nunique()
+    total_members = members_df.groupby('Group').size().reindex(groups, fill_value=0)
+    group_attendance = attendance_df.groupby('Group')['Full Name'].agg(['size', 'nunique']).reindex(groups, fill_value=0)
+    active_members = group_attendance['nunique']
+    total_attendance = group_attendance['size']
+    
+    # Zero denominators become NaN and the rates fall back to 0
+    participation_rate = (active_members / total_members.replace(0, np.nan) * 100).fillna(0)
+    avg_attendance_per_service = total_attendance / unique_days if unique_days > 0 else pd.Series(0.0, index=groups)
+    consistency_score = (total_attendance / (active_members * unique_days).replace(0, np.nan) * 100).fillna(0)
+    
+    group_df = pd.DataFrame({
+        'Total Members': total_members,
+        'Active Members': active_members,
+        'Participation Rate (%)': participation_rate.round(1),
+        'Total Attendance': total_attendance,
+        'Avg per Service': avg_attendance_per_service.round(1),
+        'Consistency Score (%)': consistency_score.round(1)
+    }).reset_index()
     
     # Display group statistics table
     st.dataframe(group_df, use_container_width=True, hide_index=True)
@@ -3852,23 +4465,23 @@ def generate_group_performance_report(attendance_df, members_df, start_date, end
                     st.plotly_chart(fig, use_container_width=True)
                 
                 # Top members in this group
-                group_member_stats = group_attendance.groupby('Full Name').size().reset_index(name='Attendance Count')
-                group_member_stats = group_member_stats.sort_values('Attendance Count', ascending=False).head(5)
+                group_member_stats = group_attendance.groupby('Full Name').size().nlargest(5).reset_index(name='Attendance Count')
                 
                 st.subheader(f"Top 5 Members in {group}")
                 st.dataframe(group_member_stats, use_container_width=True, hide_index=True)
     
-    # Export group report using universal export section
-    csv_exports = {
-        "Group Performance": group_df.to_csv(index=False)
-    }
-
     # Show export section in expander (not auto-expanded)
     with st.expander("Export Options", expanded=False):
-        create_universal_export_section(
-            attendance_df, members_df, start_date, end_date,
-            "Group Performance Report", selected_groups, csv_exports
-        )
+        if export_requested("Group Performance Report"):
+            # Export group report using universal export section
+            csv_exports = {
+                "Group Performance": group_df.to_csv(index=False)
+            }
+            
+            create_universal_export_section(
+                attendance_df, members_df, start_date, end_date,
+                "Group Performance Report", selected_groups, csv_exports
+            )
 
 
 def generate_member_engagement_report(attendance_df, members_df, start_date, end_date, selected_groups):
@@ -3880,25 +4493,12 @@ def generate_member_engagement_report(attendance_df, members_df, start_date, end
         return
     
     # Calculate member engagement statistics
-    total_services = attendance_df['Date'].dt.date.nunique()
-    member_stats = attendance_df.groupby(['Full Name', 'Group']).agg({
-        'Date': 'count'
-    }).reset_index()
-    member_stats.columns = ['Full Name', 'Group', 'Attendance Count']
+    total_services = attendance_df['Date'].dt.normalize().nunique()
+    member_stats = attendance_df.groupby(['Full Name', 'Group']).size().reset_index(name='Attendance Count')
     member_stats['Attendance Rate (%)'] = (member_stats['Attendance Count'] / total_services * 100).round(1)
     
     # Categorize engagement levels
-    def get_engagement_level(rate):
-        if rate >= 80:
-            return "Highly Engaged (80%+)"
-        elif rate >= 50:
-            return "Moderately Engaged (50-79%)"
-        elif rate >= 25:
-            return "Occasionally Engaged (25-49%)"
-        else:
-            return "Low Engagement (<25%)"
-    
-    member_stats['Engagement Level'] = member_stats['Attendance Rate (%)'].apply(get_engagement_level)
+    member_stats['Engagement Level'] = _engagement_level_series(member_stats['Attendance Rate (%)'])
     member_stats = member_stats.sort_values('Attendance Rate (%)', ascending=False)
     
     # Display engagement summary
@@ -3981,22 +4581,23 @@ def generate_member_engagement_report(attendance_df, members_df, start_date, end
         else:
             st.info("All members have good engagement levels!")
     
-    # Export member engagement report using universal export section
-    csv_exports = {
-        "Member Engagement": member_stats.to_csv(index=False)
-    }
-    
-    # Add low engagement data if it exists
-    low_engagement_full = member_stats[member_stats['Attendance Rate (%)'] < 50]
-    if not low_engagement_full.empty:
-        csv_exports["Low Engagement Members"] = low_engagement_full.to_csv(index=False)
-
     # Show export section in expander (not auto-expanded)
     with st.expander("Export Options", expanded=False):
-        create_universal_export_section(
-            attendance_df, members_df, start_date, end_date,
-            "Member Engagement Report", selected_groups, csv_exports
-        )
+        if export_requested("Member Engagement Report"):
+            # Export member engagement report using universal export section
+            csv_exports = {
+                "Member Engagement": member_stats.to_csv(index=False)
+            }
+            
+            # Add low engagement data if it exists
+            low_engagement_full = member_stats[member_stats['Attendance Rate (%)'] < 50]
+            if not low_engagement_full.empty:
+                csv_exports["Low Engagement Members"] = low_engagement_full.to_csv(index=False)
+
+            create_universal_export_section(
+                attendance_df, members_df, start_date, end_date,
+                "Member Engagement Report", selected_groups, csv_exports
+            )
 
 
 def generate_attendance_trend_report(attendance_df, start_date, end_date):
@@ -4008,8 +4609,7 @@ def generate_attendance_trend_report(attendance_df, start_date, end_date):
         return
     
     # Daily attendance trends
-    daily_attendance = attendance_df.groupby('Date').size().reset_index(name='Count')
-    daily_attendance = daily_attendance.sort_values('Date')
+    daily_attendance = _daily_counts(attendance_df['Date']).reset_index(name='Count')
     
     # Calculate moving averages
     daily_attendance['7_Day_MA'] = daily_attendance['Count'].rolling(window=7, center=True).mean()
@@ -4077,12 +4677,7 @@ def generate_attendance_trend_report(attendance_df, start_date, end_date):
     
     with col1:
         # Day of week analysis
-        attendance_df['Day_of_Week'] = attendance_df['Date'].dt.day_name()
-        day_counts = attendance_df.groupby('Day_of_Week').size().reset_index(name='Count')
-        
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        day_counts['Day_of_Week'] = pd.Categorical(day_counts['Day_of_Week'], categories=day_order, ordered=True)
-        day_counts = day_counts.sort_values('Day_of_Week')
+        day_counts = _weekday_counts(attendance_df['Date']).rename_axis('Day_of_Week').reset_index(name='Count')
         
         fig = px.bar(day_counts, x='Day_of_Week', y='Count',
                     title="Attendance by Day of Week",
@@ -4108,20 +4703,21 @@ def generate_attendance_trend_report(attendance_df, start_date, end_date):
         else:
             st.info("Need data spanning multiple months for monthly trend analysis")
     
-    # Export trend data using universal export section
-    trend_export = daily_attendance.copy()
-    trend_export['Date'] = trend_export['Date'].dt.strftime('%Y-%m-%d')
-    
-    csv_exports = {
-        "Attendance Trends": trend_export.to_csv(index=False)
-    }
-
     # Show export section in expander (not auto-expanded)
     with st.expander("Export Options", expanded=False):
-        create_universal_export_section(
-            attendance_df, pd.DataFrame(), start_date, end_date,
-            "Attendance Trend Report", None, csv_exports
-        )
+        if export_requested("Attendance Trend Report"):
+            # Export trend data using universal export section
+            trend_export = daily_attendance.copy()
+            trend_export['Date'] = trend_export['Date'].dt.strftime('%Y-%m-%d')
+            
+            csv_exports = {
+                "Attendance Trends": trend_export.to_csv(index=False)
+            }
+
+            create_universal_export_section(
+                attendance_df, pd.DataFrame(), start_date, end_date,
+                "Attendance Trend Report", None, csv_exports
+            )
 
 
 def generate_executive_summary_report(attendance_df, members_df, start_date, end_date):
@@ -4153,8 +4749,9 @@ def generate_executive_summary_report(attendance_df, members_df, start_date, end
         
         # Calculate period-over-period growth
         mid_point = start_date + (end_date - start_date) / 2
-        first_half = attendance_df[attendance_df['Date'].dt.date < mid_point]
-        second_half = attendance_df[attendance_df['Date'].dt.date >= mid_point]
+        in_first_half = attendance_df['Date'] < pd.Timestamp(mid_point)
+        first_half = attendance_df[in_first_half]
+        second_half = attendance_df[~in_first_half & attendance_df['Date'].notna()]
         
         first_half_avg = len(first_half) / (mid_point - start_date).days if (mid_point - start_date).days > 0 else 0
         second_half_avg = len(second_half) / (end_date - mid_point).days if (end_date - mid_point).days > 0 else 0
@@ -4177,7 +4774,7 @@ def generate_executive_summary_report(attendance_df, members_df, start_date, end
     
     if not attendance_df.empty:
         # Most active day
-        day_counts = attendance_df.groupby(attendance_df['Date'].dt.day_name()).size()
+        day_counts = _weekday_counts(attendance_df['Date'])
         most_active_day = day_counts.idxmax()
         insights.append(f"Most active day: **{most_active_day}** ({day_counts.max()} total attendances)")
         
@@ -4197,14 +4794,14 @@ def generate_executive_summary_report(attendance_df, members_df, start_date, end
                 insights.append(f"🏆 Best performing group: **{best_group}** ({best_rate:.1f}% participation rate)")
         
         # Attendance consistency
-        unique_days = attendance_df['Date'].dt.date.nunique()
+        unique_days = attendance_df['Date'].dt.normalize().nunique()
         if unique_days > 0:
             avg_daily = total_attendance / unique_days
             insights.append(f"Average daily attendance: **{avg_daily:.1f}** people")
         
         # Member engagement levels
         if unique_attendees > 0:
-            total_services = attendance_df['Date'].dt.date.nunique()
+            total_services = unique_days
             member_attendance_counts = attendance_df.groupby('Full Name').size()
             highly_engaged = sum(member_attendance_counts >= total_services * 0.8)
             insights.append(f"⭐ Highly engaged members (80%+ attendance): **{highly_engaged}** members")
@@ -4225,10 +4822,11 @@ def generate_executive_summary_report(attendance_df, members_df, start_date, end
         recommendations.append("🎯 Focus on retention strategies for existing active members")
     if not attendance_df.empty:
         # Check for declining trends
-        recent_week = attendance_df[attendance_df['Date'].dt.date >= (end_date - timedelta(days=7))]
+        week_start = pd.Timestamp(end_date - timedelta(days=7))
+        recent_week = attendance_df[attendance_df['Date'] >= week_start]
         earlier_week = attendance_df[
-            (attendance_df['Date'].dt.date >= (end_date - timedelta(days=14))) &
-            (attendance_df['Date'].dt.date < (end_date - timedelta(days=7)))
+            (attendance_df['Date'] >= week_start - pd.Timedelta(days=7)) &
+            (attendance_df['Date'] < week_start)
         ]
         if len(recent_week) < len(earlier_week) * 0.9:
             recommendations.append("Recent attendance decline detected - investigate potential causes")
@@ -4239,17 +4837,18 @@ def generate_executive_summary_report(attendance_df, members_df, start_date, end
     for rec in recommendations:
         st.markdown(f"• {rec}")
     
-    # Export executive summary using universal export section
-    csv_exports = {
-        "Executive Summary": attendance_df.to_csv(index=False) if not attendance_df.empty else pd.DataFrame().to_csv(index=False)
-    }
-
     # Show export section in expander (not auto-expanded)
     with st.expander("Export Options", expanded=False):
-        create_universal_export_section(
-            attendance_df, members_df, start_date, end_date,
-            "Executive Summary Report", None, csv_exports
-        )
+        if export_requested("Executive Summary Report"):
+            # Export executive summary using universal export section
+            csv_exports = {
+                "Executive Summary": attendance_df.to_csv(index=False) if not attendance_df.empty else pd.DataFrame().to_csv(index=False)
+            }
+
+            create_universal_export_section(
+                attendance_df, members_df, start_date, end_date,
+                "Executive Summary Report", None, csv_exports
+            )
 
 
 def generate_custom_date_range_report(attendance_df, members_df, start_date, end_date, selected_groups):
@@ -4264,7 +4863,7 @@ def generate_custom_date_range_report(attendance_df, members_df, start_date, end
         
         total_attendance = len(attendance_df)
         unique_attendees = attendance_df['Full Name'].nunique()
-        unique_days = attendance_df['Date'].dt.date.nunique()
+        unique_days = attendance_df['Date'].dt.normalize().nunique()
         period_length = (end_date - start_date).days + 1
         
         with col1:
@@ -4293,21 +4892,22 @@ def generate_custom_date_range_report(attendance_df, members_df, start_date, end
             group_df = pd.DataFrame(group_data)
             st.dataframe(group_df, use_container_width=True, hide_index=True)
         
-        # Export comprehensive report using universal export section
-        export_data = attendance_df.copy()
-        export_data['Date'] = export_data['Date'].dt.strftime('%Y-%m-%d')
-        
-        csv_exports = {
-            "Custom Report": export_data.to_csv(index=False),
-            "Group Summary": group_df.to_csv(index=False)
-        }
-
         # Show export section in expander (not auto-expanded)
         with st.expander("Export Options", expanded=False):
-            create_universal_export_section(
-                attendance_df, members_df, start_date, end_date,
-                "Custom Date Range Report", selected_groups, csv_exports
-            )
+            if export_requested("Custom Date Range Report"):
+                # Export comprehensive report using universal export section
+                export_data = attendance_df.copy()
+                export_data['Date'] = export_data['Date'].dt.strftime('%Y-%m-%d')
+                
+                csv_exports = {
+                    "Custom Report": export_data.to_csv(index=False),
+                    "Group Summary": group_df.to_csv(index=False)
+                }
+
+                create_universal_export_section(
+                    attendance_df, members_df, start_date, end_date,
+                    "Custom Date Range Report", selected_groups, csv_exports
+                )
     else:
         st.warning("No attendance data found for the selected period and groups.")
 
@@ -4418,8 +5018,8 @@ def show_history():
     if len(date_range) == 2:
         start_date, end_date = date_range
         filtered_df = filtered_df[
-            (filtered_df['Date'].dt.date >= start_date) & 
-            (filtered_df['Date'].dt.date <= end_date)
+            (filtered_df['Date'] >= pd.Timestamp(start_date)) & 
+            (filtered_df['Date'] < pd.Timestamp(end_date) + pd.Timedelta(days=1))
         ]
     
     # Group filter
@@ -4428,7 +5028,7 @@ def show_history():
     
     # Name search filter
     if search_term:
-        mask = filtered_df['Full Name'].str.contains(search_term, case=False, na=False)
+        mask = filtered_df['Full Name'].str.contains(search_term, case=False, regex=False, na=False)
         filtered_df = filtered_df[mask]
     
     # Sort data
@@ -4444,7 +5044,7 @@ def show_history():
         unique_members = filtered_df['Full Name'].nunique() if not filtered_df.empty else 0
         st.metric("Unique Members", unique_members)
     with col3:
-        unique_dates = filtered_df['Date'].dt.date.nunique() if not filtered_df.empty else 0
+        unique_dates = filtered_df['Date'].dt.normalize().nunique() if not filtered_df.empty else 0
         st.metric("Unique Dates", unique_dates)
     with col4:
         if not filtered_df.empty:
@@ -4587,33 +5187,25 @@ def show_history():
         with col1:
             if st.button("Delete All Filtered Records", key="confirm_bulk_delete", type="primary", disabled=(confirmation != "DELETE")):
                 if confirmation == "DELETE":
-                    deleted_count = 0
                     total_to_delete = len(filtered_df)
                     
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
+                    # Date, name and timestamp identify each record; all rows go in one request
+                    records_to_delete = pd.DataFrame({
+                        'Date': filtered_df['Date'].dt.strftime('%Y-%m-%d'),
+                        'Full Name': filtered_df['Full Name'],
+                        'Timestamp': filtered_df['Timestamp'] if 'Timestamp' in filtered_df.columns else ''
+                    }).to_dict('records')
                     
-                    # Delete records one by one
-                    for idx, (_, record) in enumerate(filtered_df.iterrows()):
-                        record_to_delete = {
-                            'Date': record['Date'].strftime('%Y-%m-%d'),
-                            'Full Name': record['Full Name'],
-                            'Timestamp': record.get('Timestamp', '')
-                        }
-                        
-                        if st.session_state.sheets_manager.delete_attendance_record(record_to_delete):
-                            deleted_count += 1
-                        
-                        # Update progress
-                        progress = (idx + 1) / total_to_delete
-                        progress_bar.progress(progress)
-                        status_text.text(f"Deleted {deleted_count}/{total_to_delete} records...")
-                        time.sleep(0.1)  # Small delay to show progress
+                    with st.spinner(f"Deleting {total_to_delete} records..."):
+                        deleted = st.session_state.sheets_manager.delete_attendance_records(records_to_delete)
                     
-                    st.success(f"Successfully deleted {deleted_count} out of {total_to_delete} records!")
-                    st.session_state.show_bulk_delete = False
-                    time.sleep(2)
-                    st.rerun()
+                    if deleted:
+                        st.success(f"Successfully deleted {total_to_delete} records!")
+                        st.session_state.show_bulk_delete = False
+                        time.sleep(2)
+                        st.rerun()
+                    else:
+                        st.error("Could not delete the records. The attendance sheet may have changed, please try again.")
                 else:
                     st.error("Please type DELETE to confirm")
         
@@ -4658,7 +5250,7 @@ def show_history():
                 member_history = attendance_df[attendance_df['Full Name'] == record['Full Name']].copy()
                 if len(member_history) > 1:
                     st.write("**Member's Attendance History:**")
-                    member_history = member_history.sort_values('Date', ascending=False).head(10)
+                    member_history = member_history.nlargest(10, 'Date')
                     member_history['Date'] = member_history['Date'].dt.strftime('%Y-%m-%d')
                     st.dataframe(
                         member_history[['Date', 'Group']],
@@ -4786,6 +5378,10 @@ def show_history():
                             st.rerun()
 
 
+# Above this many rows the admin data quality panel works on a sample
+QUALITY_CHECK_SAMPLE_SIZE = 50_000
+
+
 def show_admin_panel():
     """Display comprehensive admin panel with system management tools"""
     st.markdown("""
@@ -4804,24 +5400,27 @@ def show_admin_panel():
         status = "🟢 Connected" if st.session_state.sheets_manager.connection_status else "🔴 Disconnected"
         st.metric("Connection Status", status)
     
+    cache_stats = st.session_state.sheets_manager.cache_stats()
+    
     with col2:
-        cache_size = len(st.session_state.sheets_manager.cache)
-        st.metric("Cache Entries", cache_size)
+        st.metric("Cache Entries", cache_stats['entries'])
     
     with col3:
-        # Calculate cache age
-        if st.session_state.sheets_manager.cache:
-            oldest_cache = min(time.time() - cached_time for cached_time, _ in st.session_state.sheets_manager.cache.values())
+        # Calculate cache age, ignoring entries past their ttl
+        cache_ages = [time.time() - loaded_at for loaded_at in st.session_state.sheets_manager.cache_loaded.values()]
+        cache_ages = [age for age in cache_ages if age < st.session_state.sheets_manager.cache_timeout]
+        if cache_ages:
+            oldest_cache = max(cache_ages)
             cache_age = f"{int(oldest_cache // 60)}m {int(oldest_cache % 60)}s"
         else:
             cache_age = "No cache"
         st.metric("Oldest Cache", cache_age)
     
     with col4:
-        # Memory usage approximation
-        cache_memory = sum(len(str(data)) for _, data in st.session_state.sheets_manager.cache.values())
-        memory_mb = cache_memory / (1024 * 1024)
-        st.metric("Cache Memory", f"{memory_mb:.2f} MB")
+        # Share of sheet loads served without a Sheets request
+        lookups = cache_stats['hits'] + cache_stats['misses']
+        hit_rate = cache_stats['hits'] / lookups * 100 if lookups else 0
+        st.metric("Cache Hit Rate", f"{hit_rate:.0f}%")
     
     # System Actions
     col1, col2, col3 = st.columns(3)
@@ -4847,9 +5446,10 @@ def show_admin_panel():
     with col3:
         if st.button("Force Data Refresh", use_container_width=True):
             with st.spinner("Refreshing all data..."):
+                # clear_cache drops the shared caches once; the loaders then refill them
                 st.session_state.sheets_manager.clear_cache()
-                members_df = st.session_state.sheets_manager.load_members(use_cache=False)
-                attendance_df = st.session_state.sheets_manager.load_attendance(use_cache=False)
+                members_df = st.session_state.sheets_manager.load_members()
+                attendance_df = st.session_state.sheets_manager.load_attendance()
                 st.success("Data refreshed from Google Sheets!")
     
     st.divider()
@@ -4857,9 +5457,9 @@ def show_admin_panel():
     # Data Management Section
     st.subheader("Data Management")
     
-    # Load fresh data for accurate statistics
-    members_df = st.session_state.sheets_manager.load_members(use_cache=False)
-    attendance_df = st.session_state.sheets_manager.load_attendance(use_cache=False)
+    # Cached data; the caches are shared by every session, so only the refresh buttons clear them
+    members_df = st.session_state.sheets_manager.load_members()
+    attendance_df = st.session_state.sheets_manager.load_attendance()
     
     # Data statistics
     col1, col2, col3, col4 = st.columns(4)
@@ -4886,44 +5486,70 @@ def show_admin_panel():
     
     # Data Quality Checks
     st.subheader("Data Quality Analysis")
-    
+
+    # Sample very large sheets so this at-a-glance panel stays responsive;
+    # exact counts remain available on demand via "Run full audit"
+    quality_members = members_df
+    quality_attendance = attendance_df
+    if len(members_df) > QUALITY_CHECK_SAMPLE_SIZE or len(attendance_df) > QUALITY_CHECK_SAMPLE_SIZE:
+        st.caption(f"Counts prefixed with ≈ are estimated from a {QUALITY_CHECK_SAMPLE_SIZE:,}-record sample")
+        if not st.button("Run full audit", key="run_full_quality_audit"):
+            if len(members_df) > QUALITY_CHECK_SAMPLE_SIZE:
+                quality_members = members_df.sample(QUALITY_CHECK_SAMPLE_SIZE, random_state=0)
+            if len(attendance_df) > QUALITY_CHECK_SAMPLE_SIZE:
+                quality_attendance = attendance_df.sample(QUALITY_CHECK_SAMPLE_SIZE, random_state=0)
+
+    def format_count(count, sample_df, full_df, pairs=False):
+        """
+        Scale a sample count up to the full table and mark it as estimated.
+
+        A duplicate is only flagged when both records of its pair were sampled,
+        which happens with probability p², so pair-based counts scale by (N/n)².
+        """
+        if len(sample_df) == len(full_df):
+            return f"{count}"
+        scale = len(full_df) / len(sample_df)
+        return f"≈{round(count * (scale ** 2 if pairs else scale))}"
+
     issues = []
     
-    if not members_df.empty:
+    if not quality_members.empty:
         # Check for duplicate members
-        duplicate_members = members_df[members_df.duplicated(subset=['Full Name', 'Group'], keep=False)]
+        duplicate_members = quality_members[quality_members.duplicated(subset=['Full Name', 'Group'], keep=False)]
         if not duplicate_members.empty:
-            issues.append(f"Found {len(duplicate_members)} potential duplicate member records")
+            issues.append(f"Found {format_count(len(duplicate_members), quality_members, members_df, pairs=True)} potential duplicate member records")
         
         # Check for missing required fields
-        missing_names = members_df['Full Name'].isna().sum()
+        missing_names = int(quality_members['Full Name'].isna().values.sum())
         if missing_names > 0:
-            issues.append(f"Found {missing_names} members with missing names")
+            issues.append(f"Found {format_count(missing_names, quality_members, members_df)} members with missing names")
         
-        missing_groups = members_df['Group'].isna().sum() if 'Group' in members_df.columns else 0
+        missing_groups = int(quality_members['Group'].isna().values.sum()) if 'Group' in quality_members.columns else 0
         if missing_groups > 0:
-            issues.append(f"Found {missing_groups} members with missing groups")
+            issues.append(f"Found {format_count(missing_groups, quality_members, members_df)} members with missing groups")
     
-    if not attendance_df.empty:
+    if not quality_attendance.empty:
         # Check for orphaned attendance records (members not in members list)
         if not members_df.empty:
             member_names = set(members_df['Full Name'].dropna())
-            attendance_names = set(attendance_df['Full Name'].dropna())
+            attendance_names = set(quality_attendance['Full Name'].dropna())
             orphaned = attendance_names - member_names
             if orphaned:
-                issues.append(f"Found {len(orphaned)} attendance records for members not in member list")
+                # Distinct names can't be scaled from a sample; a sample only finds some of them
+                orphaned_count = f"{len(orphaned)}" if len(quality_attendance) == len(attendance_df) else f"at least {len(orphaned)}"
+                issues.append(f"Found {orphaned_count} names in attendance records that are not in the member list")
         
         # Check for invalid dates
-        future_dates = attendance_df[attendance_df['Date'].dt.date > date.today()]
+        future_dates = quality_attendance[quality_attendance['Date'] >= pd.Timestamp(date.today() + timedelta(days=1))]
         if not future_dates.empty:
-            issues.append(f"Found {len(future_dates)} attendance records with future dates")
+            issues.append(f"Found {format_count(len(future_dates), quality_attendance, attendance_df)} attendance records with future dates")
         
         # Check for duplicate attendance records
-        duplicate_attendance = attendance_df[
-            attendance_df.duplicated(subset=['Date', 'Full Name'], keep=False)
+        duplicate_attendance = quality_attendance[
+            quality_attendance.duplicated(subset=['Date', 'Full Name'], keep=False)
         ]
         if not duplicate_attendance.empty:
-            issues.append(f"Found {len(duplicate_attendance)} potential duplicate attendance records")
+            issues.append(f"Found {format_count(len(duplicate_attendance), quality_attendance, attendance_df, pairs=True)} potential duplicate attendance records")
     
     if issues:
         st.warning("Data Quality Issues Found:")
@@ -5043,7 +5669,7 @@ def show_admin_panel():
             if uploaded_file is not None:
                 try:
                     # Read the uploaded CSV
-                    import_df = pd.read_csv(uploaded_file)
+                    import_df = read_members_csv(uploaded_file)
 
                     st.success(f"File loaded successfully! Found {len(import_df)} records.")
 
@@ -5142,18 +5768,19 @@ def show_admin_panel():
                                         clean_import_df = clean_import_df[~clean_import_df['_key'].isin(existing_keys)]
                                         clean_import_df = clean_import_df.drop(columns=['_key'])
 
-                                if update_existing:
-                                    # Merge with existing data
-                                    combined_df = pd.concat([existing_members, clean_import_df], ignore_index=True)
-                                    combined_df = combined_df.drop_duplicates(subset=['Full Name', 'Group'], keep='last')
-                                    final_df = combined_df
-                                else:
-                                    # Append new records
-                                    final_df = pd.concat([existing_members, clean_import_df], ignore_index=True)
-
                                 # Save to Google Sheets
                                 try:
-                                    st.session_state.sheets_manager.save_members(final_df)
+                                    if update_existing:
+                                        # Merge with existing data and rewrite the sheet
+                                        combined_df = pd.concat([existing_members, clean_import_df], ignore_index=True)
+                                        combined_df = combined_df.drop_duplicates(subset=['Full Name', 'Group'], keep='last')
+                                        st.session_state.sheets_manager.save_members(combined_df)
+                                    elif existing_members.empty:
+                                        # Empty sheet: write it whole so it gets its header row
+                                        st.session_state.sheets_manager.save_members(clean_import_df)
+                                    else:
+                                        # Append only the new records
+                                        st.session_state.sheets_manager.append_members(clean_import_df)
                                     st.success(f"✅ Successfully imported {len(clean_import_df)} member records!")
                                     st.balloons()
 
@@ -5337,7 +5964,7 @@ def show_admin_panel():
                     st.subheader("Duplicate Records Preview")
                     display_df = duplicate_members.copy()
                     if 'Phone' in display_df.columns:
-                        display_df['Phone'] = display_df['Phone'].apply(format_phone_number)
+                        display_df['Phone'] = _format_phone_series(display_df['Phone'])
                     st.dataframe(display_df.sort_values(['Full Name', 'Group']), use_container_width=True)
 
                     # Cleanup options
@@ -5609,17 +6236,15 @@ def show_admin_panel():
         with col1:
             if st.button("Clear Members Cache", use_container_width=True):
                 # Clear only members-related cache
-                keys_to_remove = [key for key in st.session_state.sheets_manager.cache.keys() if 'load_members' in key]
-                for key in keys_to_remove:
-                    del st.session_state.sheets_manager.cache[key]
+                _fetch_members.clear()
+                st.session_state.sheets_manager.cache_loaded.pop('Members', None)
                 st.success("Members cache cleared!")
         
         with col2:
             if st.button("Clear Attendance Cache", use_container_width=True):
                 # Clear only attendance-related cache
-                keys_to_remove = [key for key in st.session_state.sheets_manager.cache.keys() if 'load_attendance' in key]
-                for key in keys_to_remove:
-                    del st.session_state.sheets_manager.cache[key]
+                _fetch_attendance.clear()
+                st.session_state.sheets_manager.cache_loaded.pop('Attendance', None)
                 st.success("Attendance cache cleared!")
         
         with col3:
@@ -5631,62 +6256,60 @@ def show_admin_panel():
                 st.success("Session data reset!")
                 st.rerun()
         
-        # Performance monitoring
-        st.write("**Performance Monitoring**")
-        
-        # Show recent API call timing if available
-        if hasattr(st.session_state.sheets_manager, '_last_call_times'):
-            st.info("API call timing data would be displayed here (feature coming soon)")
+        # Performance monitoring (rarely opened, so collapsed by default)
+        with st.expander("Performance Monitoring", expanded=False):
+            # Show recent API call timing if available
+            if hasattr(st.session_state.sheets_manager, '_last_call_times'):
+                st.info("API call timing data would be displayed here (feature coming soon)")
         
         # System diagnostics
-        st.write("**System Diagnostics**")
-        col1, col2 = st.columns(2)
+        with st.expander("System Diagnostics", expanded=False):
+            col1, col2 = st.columns(2)
         
-        with col1:
-            if st.button("🩺 Run Connection Test", use_container_width=True):
-                with st.spinner("Testing connection..."):
-                    try:
-                        test_result = st.session_state.sheets_manager.initialize_connection()
-                        if test_result:
-                            st.success("Connection test passed!")
-                        else:
-                            st.error("Connection test failed!")
-                    except Exception as e:
-                        st.error(f"Connection test error: {str(e)}")
+            with col1:
+                if st.button("🩺 Run Connection Test", use_container_width=True):
+                    with st.spinner("Testing connection..."):
+                        try:
+                            test_result = st.session_state.sheets_manager.initialize_connection()
+                            if test_result:
+                                st.success("Connection test passed!")
+                            else:
+                                st.error("Connection test failed!")
+                        except Exception as e:
+                            st.error(f"Connection test error: {str(e)}")
         
-        with col2:
-            if st.button("Check Data Integrity", use_container_width=True):
-                with st.spinner("Checking data integrity..."):
-                    integrity_issues = 0
+            with col2:
+                if st.button("Check Data Integrity", use_container_width=True):
+                    with st.spinner("Checking data integrity..."):
+                        integrity_issues = 0
                     
-                    # Check if all required worksheets exist
-                    try:
-                        members_test = st.session_state.sheets_manager.load_members(use_cache=False)
-                        attendance_test = st.session_state.sheets_manager.load_attendance(use_cache=False)
-                        st.success("Data integrity check passed!")
-                    except Exception as e:
-                        st.error(f"Data integrity issues found: {str(e)}")
-                        integrity_issues += 1
-    
-    # System Information
+                        # Check if all required worksheets exist
+                        try:
+                            members_test = st.session_state.sheets_manager.load_members()
+                            attendance_test = st.session_state.sheets_manager.load_attendance()
+                            st.success("Data integrity check passed!")
+                        except Exception as e:
+                            st.error(f"Data integrity issues found: {str(e)}")
+                            integrity_issues += 1
+    
+    # System Information (collapsed by default)
     st.divider()
-    st.subheader("System Information")
-    
-    col1, col2 = st.columns(2)
+    with st.expander("System Information", expanded=False):
+        col1, col2 = st.columns(2)
     
-    with col1:
-        st.write("**Application Info**")
-        st.write("• **Version:** Church Attendance System v1.0")
-        st.write("• **Framework:** Streamlit")
-        st.write("• **Storage:** Google Sheets")
-        st.write("• **Cache Timeout:** 5 minutes")
+        with col1:
+            st.write("**Application Info**")
+            st.write("• **Version:** Church Attendance System v1.0")
+            st.write("• **Framework:** Streamlit")
+            st.write("• **Storage:** Google Sheets")
+            st.write("• **Cache Timeout:** 5 minutes")
     
-    with col2:
-        st.write("**Current Session**")
-        st.write(f"• **Session Started:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        st.write(f"• **Cache Entries:** {len(st.session_state.sheets_manager.cache)}")
-        st.write(f"• **Connection Status:** {'Active' if st.session_state.sheets_manager.connection_status else 'Inactive'}")
-        st.write(f"• **Rate Limiting:** Active")
+        with col2:
+            st.write("**Current Session**")
+            st.write(f"• **Session Started:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            st.write(f"• **Cache Entries:** {st.session_state.sheets_manager.cache_stats()['entries']}")
+            st.write(f"• **Connection Status:** {'Active' if st.session_state.sheets_manager.connection_status else 'Inactive'}")
+            st.write(f"• **Rate Limiting:** Active")
 
 
 # PDF Generation Functions
@@ -6094,6 +6717,16 @@ TAC - Mamprobi Central Attendance System
         return False
 
 
+def export_requested(report_type: str) -> bool:
+    """
+    Show a "Prepare export" toggle for a report.
+
+    Expander bodies run on every rerun even while collapsed, so reports only
+    build their CSV, PDF and email exports while this toggle is on.
+    """
+    return st.toggle("Prepare export", key=f"prepare_export_{report_type.lower().replace(' ', '_')}")
+
+
 def create_universal_export_section(attendance_df: pd.DataFrame, members_df: pd.DataFrame, 
                                    start_date: date, end_date: date, report_type: str,
                                    selected_groups: List[str] = None, additional_csv_data: dict = None):
@@ -6315,7 +6948,7 @@ def extract_report_data_for_pdf(attendance_df: pd.DataFrame, members_df: pd.Data
     # Common metrics used across reports
     total_attendance = len(attendance_df)
     unique_attendees = attendance_df['Full Name'].nunique()
-    unique_days = attendance_df['Date'].dt.date.nunique()
+    unique_days = attendance_df['Date'].dt.normalize().nunique()
     avg_daily_attendance = total_attendance / unique_days if unique_days > 0 else 0
     total_members = len(members_df) if not members_df.empty else 0
     participation_rate = (unique_attendees / total_members * 100) if total_members > 0 else 0
@@ -6343,8 +6976,7 @@ def extract_report_data_for_pdf(attendance_df: pd.DataFrame, members_df: pd.Data
         report_data['tables']['Daily Attendance'] = daily
 
         # Top attendees
-        top = attendance_df.groupby('Full Name').size().reset_index(name='Days Attended')
-        top = top.sort_values('Days Attended', ascending=False).head(10)
+        top = attendance_df.groupby('Full Name').size().nlargest(10).reset_index(name='Days Attended')
         report_data['tables']['Top Attendees'] = top
 
         report_data['summary'] = [
@@ -6364,11 +6996,9 @@ def extract_report_data_for_pdf(attendance_df: pd.DataFrame, members_df: pd.Data
             }
 
             # Detailed group breakdown
-            group_stats = attendance_df.groupby('Group').agg({
-                'Full Name': 'nunique',
-                'Date': 'count'
-            }).reset_index()
-            group_stats.columns = ['Group', 'Unique Members', 'Total Attendance']
+            group_stats = attendance_df.groupby('Group')['Full Name'].agg(
+                **{'Unique Members': 'nunique', 'Total Attendance': 'size'}
+            ).reset_index()
             group_stats['Avg Attendance'] = (group_stats['Total Attendance'] / unique_days).round(1)
             report_data['tables']['Group Performance'] = group_stats
 
@@ -6429,7 +7059,7 @@ def extract_report_data_for_pdf(attendance_df: pd.DataFrame, members_df: pd.Data
             'Period Span': f"{unique_days} days",
             'Total Attendance': total_attendance,
             'Daily Average': f"{avg_daily_attendance:.1f}",
-            'Peak Attendance': attendance_df.groupby(attendance_df['Date'].dt.date).size().max()
+            'Peak Attendance': attendance_df.groupby(attendance_df['Date'].dt.normalize()).size().max()
         }
 
         # Daily trend
@@ -6447,7 +7077,7 @@ def extract_report_data_for_pdf(attendance_df: pd.DataFrame, members_df: pd.Data
         report_data['summary'] = [
             f"Trend analysis over {unique_days} days",
             f"Average daily attendance: {avg_daily_attendance:.1f}",
-            f"Peak attendance: {attendance_df.groupby(attendance_df['Date'].dt.date).size().max()}"
+            f"Peak attendance: {attendance_df.groupby(attendance_df['Date'].dt.normalize()).size().max()}"
         ]
 
     elif report_type == "Executive Summary":
@@ -6463,16 +7093,13 @@ def extract_report_data_for_pdf(attendance_df: pd.DataFrame, members_df: pd.Data
 
         # Key statistics table
         if 'Group' in attendance_df.columns:
-            group_summary = attendance_df.groupby('Group').agg({
-                'Full Name': 'nunique',
-                'Date': 'count'
-            }).reset_index()
-            group_summary.columns = ['Group', 'Active Members', 'Attendance']
+            group_summary = attendance_df.groupby('Group')['Full Name'].agg(
+                **{'Active Members': 'nunique', 'Attendance': 'size'}
+            ).reset_index()
             report_data['tables']['Group Summary'] = group_summary
 
         # Top performers
-        top = attendance_df.groupby('Full Name').size().reset_index(name='Attendance')
-        top = top.sort_values('Attendance', ascending=False).head(5)
+        top = attendance_df.groupby('Full Name').size().nlargest(5).reset_index(name='Attendance')
         report_data['tables']['Top 5 Attendees'] = top
 
         report_data['summary'] = [
@@ -6502,8 +7129,7 @@ def extract_report_data_for_pdf(attendance_df: pd.DataFrame, members_df: pd.Data
             report_data['tables']['Group Summary'] = group
 
         # Top attendees
-        top = attendance_df.groupby('Full Name').size().reset_index(name='Days Attended')
-        top = top.sort_values('Days Attended', ascending=False).head(10)
+        top = attendance_df.groupby('Full Name').size().nlargest(10).reset_index(name='Days Attended')
         report_data['tables']['Top Attendees'] = top
 
         report_data['summary'] = [
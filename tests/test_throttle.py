@@ -0,0 +1,88 @@
+"""Retry behaviour of the @throttle decorator for nested Sheets calls"""
+import pytest
+
+for module in ('streamlit', 'gspread', 'plotly', 'reportlab', 'extra_streamlit_components'):
+    pytest.importorskip(module)
+
+import gspread
+
+import church_attendance_optimized as app
+
+
+class QuotaResponse:
+    """Minimal stand-in for the requests response gspread wraps in APIError"""
+    status_code = 429
+    text = 'Quota exceeded'
+
+    def json(self):
+        return {'error': {'code': 429, 'message': 'Quota exceeded', 'status': 'RESOURCE_EXHAUSTED'}}
+
+
+class CountingSemaphore:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(app.time, 'sleep', calls.append)
+    return calls
+
+
+@pytest.fixture
+def semaphore(monkeypatch):
+    counter = CountingSemaphore()
+    monkeypatch.setattr(app, '_sheets_semaphore', counter)
+    return counter
+
+
+def test_nested_quota_error_is_retried_only_by_outer_call(sleeps, semaphore):
+    bucket = app.TokenBucket(capacity=100, refill_per_sec=100.0)
+    inner_calls = []
+
+    @app.throttle(bucket, max_retries=3)
+    def inner():
+        inner_calls.append(1)
+        raise gspread.exceptions.APIError(QuotaResponse())
+
+    @app.throttle(bucket, max_retries=3)
+    def outer():
+        return inner()
+
+    with pytest.raises(gspread.exceptions.APIError):
+        outer()
+
+    # One inner call per outer attempt, not max_retries ** 2
+    assert len(inner_calls) == 4
+    assert len(sleeps) == 3
+    # The nested call reuses the outer call's semaphore slot
+    assert semaphore.acquired == 4
+    assert not getattr(app._throttle_state, 'in_flight', False)
+
+
+def test_nested_quota_error_recovers_on_outer_retry(sleeps, semaphore):
+    bucket = app.TokenBucket(capacity=100, refill_per_sec=100.0)
+    inner_calls = []
+
+    @app.throttle(bucket)
+    def inner():
+        inner_calls.append(1)
+        if len(inner_calls) == 1:
+            raise gspread.exceptions.APIError(QuotaResponse())
+        return 'ok'
+
+    @app.throttle(bucket)
+    def outer():
+        return inner()
+
+    assert outer() == 'ok'
+    assert len(inner_calls) == 2
+    assert len(sleeps) == 1
+    assert semaphore.acquired == 2